@@ -1,4 +1,6 @@
 class Node:
+    __slots__ = ('node_id', 'address', 'key_value_store', 'replicas', 'is_online')
+
     def __init__(self, node_id, address):
         self.node_id = node_id
         self.address = address
@@ -1,26 +1,58 @@
+from array import array
+
+
 class Routing:
-    def __init__(self, node_id, node_address):
+    __slots__ = ('node_id', 'node_address', 'm', 'ring_size', 'successor', 'predecessor',
+                 'finger_table', '_finger_ids')
+
+    def __init__(self, node_id, node_address, m=8):
         self.node_id = node_id
         self.node_address = node_address
+        self.m = m
+        self.ring_size = 2 ** m
         self.successor = None
         self.predecessor = None
-        self.finger_table = []
+        # finger_table[i] = successor(node_id + 2^i)
+        self.finger_table = [None] * m
+        # Node ids of finger_table entries (-1 when unset), kept in sync by update_finger_table
+        self._finger_ids = array('l', [-1] * m)
+
+    def _in_interval(self, x, a, b, inclusive_end=False):
+        """Check whether x lies in the ring interval (a, b), or (a, b] if inclusive_end."""
+        if inclusive_end and x == b:
+            return True
+        # Distances measured clockwise from a; a == b spans the whole ring
+        dist_x = (x - a) % self.ring_size
+        dist_b = (b - a) % self.ring_size or self.ring_size
+        return 0 < dist_x < dist_b
 
     def find_successor(self, id):
-        if self.successor and self.successor.node_id >= id:
-            return self.successor
-        else:
-            # Forward the request to the closest preceding node
-            return self.closest_preceding_node(id).find_successor(id)
+        node = self
+        while True:
+            successor = node.successor
+            if successor is None:
+                return node
+            if node._in_interval(id, node.node_id, successor.node_id, inclusive_end=True):
+                return successor
+            # Forward the request to the closest preceding node; with no
+            # usable finger, fall back to walking the successor pointer
+            next_node = node.closest_preceding_node(id)
+            node = successor if next_node is node else next_node
 
     def closest_preceding_node(self, id):
-        for node in reversed(self.finger_table):
-            if node.node_id < id:
-                return node
+        finger_ids = self._finger_ids
+        ring_size = self.ring_size
+        # Finger must lie in (node_id, id); compare clockwise distances from node_id
+        dist_id = (id - self.node_id) % ring_size or ring_size
+        for i in range(self.m - 1, -1, -1):
+            finger_id = finger_ids[i]
+            if finger_id >= 0 and 0 < (finger_id - self.node_id) % ring_size < dist_id:
+                return self.finger_table[i]
         return self  # If no node is found, return self
 
     def update_finger_table(self, node, index):
         self.finger_table[index] = node
+        self._finger_ids[index] = node.node_id if node is not None else -1
 
     def notify(self, node):
         if not self.predecessor or node.node_id > self.predecessor.node_id:
@@ -32,5 +64,5 @@ class Routing:
             'address': self.node_address,
             'successor': self.successor.node_id if self.successor else None,
             'predecessor': self.predecessor.node_id if self.predecessor else None,
-            'finger_table': [n.node_id for n in self.finger_table]
-        }
\ No newline at end of file
+            'finger_table': [n.node_id if n else None for n in self.finger_table]
+        }
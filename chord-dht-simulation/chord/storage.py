@@ -1,18 +1,13 @@
 class Storage:
     def __init__(self):
         self.data = {}  # Dictionary to store key-value pairs
-        self.replicas = {}  # Dictionary to store replicas for each key
+        self.replicas = {}  # key -> ids of the nodes holding its replicas
 
-    def put(self, key, value, replicas_count=3):
-        """Store a key-value pair with specified number of replicas."""
+    def put(self, key, value, replica_ids=None):
+        """Store a key-value pair, recording the ids of the nodes replicating it."""
         self.data[key] = value
-        self.replicas[key] = []
-
-        # Create replicas
-        for i in range(replicas_count):
-            replica_key = f"{key}_replica_{i}"
-            self.replicas[key].append(replica_key)
-            self.data[replica_key] = value  # Store the same value for replicas
+        # Replicas live on other nodes; only their ids are tracked here
+        self.replicas[key] = list(replica_ids) if replica_ids else []
 
     def get(self, key):
         """Retrieve the value for a given key."""
@@ -23,13 +18,10 @@ class Storage:
         return self.replicas.get(key, [])
 
     def remove(self, key):
-        """Remove a key and its replicas from storage."""
+        """Remove a key and its replica metadata from storage."""
         if key in self.data:
             del self.data[key]
         if key in self.replicas:
-            for replica in self.replicas[key]:
-                if replica in self.data:
-                    del self.data[replica]
             del self.replicas[key]
 
     def list_keys(self):
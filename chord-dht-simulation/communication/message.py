@@ -1,4 +1,7 @@
-class MessageType:
+from dataclasses import dataclass
+from enum import Enum
+
+class MessageType(str, Enum):
     PUT = "PUT"
     GET = "GET"
     PUT_REPLY = "PUT_REPLY"
@@ -9,13 +12,15 @@ class MessageType:
     GET_ALL_KEYS = "GET_ALL_KEYS"
     GET_ALL_KEYS_REPLY = "GET_ALL_KEYS_REPLY"
 
+@dataclass
 class Message:
-    def __init__(self, msg_type: str, sender_id: int, sender_address: str, msg_id: int, data: dict):
-        self.msg_type = msg_type
-        self.sender_id = sender_id
-        self.sender_address = sender_address
-        self.msg_id = msg_id
-        self.data = data
+    __slots__ = ('msg_type', 'sender_id', 'sender_address', 'msg_id', 'data')
+
+    msg_type: MessageType
+    sender_id: int
+    sender_address: str
+    msg_id: int
+    data: dict
 
     def to_dict(self):
         return {
@@ -29,7 +34,7 @@ class Message:
     @staticmethod
     def from_dict(data: dict):
         return Message(
-            msg_type=data["msg_type"],
+            msg_type=MessageType(data["msg_type"]),
             sender_id=data["sender_id"],
             sender_address=data["sender_address"],
             msg_id=data["msg_id"],
@@ -1,5 +1,11 @@
 # Configuration settings for the Chord DHT simulation project
 
+import random
+import string
+
+_KEY_ALPHABET = string.ascii_letters + string.digits
+_node_addresses = {}  # node_id -> address, filled by Config.get_node_address
+
 class Config:
     # General settings
     NODE_COUNT = 10  # Default number of nodes in the simulation
@@ -20,13 +26,13 @@ class Config:
     @staticmethod
     def get_node_address(node_id):
         """Generate a node address based on its ID."""
-        return f"localhost:{5000 + node_id}"  # Example address format
+        address = _node_addresses.get(node_id)
+        if address is None:
+            address = _node_addresses[node_id] = f"localhost:{5000 + node_id}"  # Example address format
+        return address
 
     @staticmethod
     def get_key_value_pair():
         """Generate a random key-value pair for simulation."""
-        import random
-        import string
-        key = ''.join(random.choices(string.ascii_letters + string.digits, k=8))
-        value = ''.join(random.choices(string.ascii_letters + string.digits, k=12))
-        return key, value
\ No newline at end of file
+        chars = random.choices(_KEY_ALPHABET, k=20)
+        return ''.join(chars[:8]), ''.join(chars[8:])
\ No newline at end of file
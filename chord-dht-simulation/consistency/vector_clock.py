@@ -1,4 +1,6 @@
 class VectorClock:
+    __slots__ = ('node_id', 'clock')
+
     def __init__(self, node_id):
         self.node_id = node_id
         self.clock = {}
@@ -18,8 +20,14 @@ class VectorClock:
 
     def merge(self, other_clock):
         merged_clock = VectorClock(self.node_id)
-        merged_clock.update(self.clock)
-        merged_clock.update(other_clock.clock)
+        self_clock = self.clock
+        other = other_clock.clock
+        merged = {**self_clock, **other}
+        # Only entries present in both clocks need the element-wise max
+        for node in self_clock.keys() & other.keys():
+            if self_clock[node] > other[node]:
+                merged[node] = self_clock[node]
+        merged_clock.clock = merged
         return merged_clock
 
     def __lt__(self, other):
@@ -29,22 +37,30 @@ class VectorClock:
         return self.clock == other.clock
 
     def compare(self, other):
-        self_keys = set(self.clock.keys())
-        other_keys = set(other.clock.keys())
-        all_keys = self_keys.union(other_keys)
-
         self_less = False
         other_less = False
 
-        for key in all_keys:
-            self_value = self.clock.get(key, 0)
-            other_value = other.clock.get(key, 0)
+        self_clock = self.clock
+        other_clock = other.clock
+
+        for key, self_value in self_clock.items():
+            other_value = other_clock.get(key, 0)
 
             if self_value < other_value:
                 self_less = True
             elif self_value > other_value:
                 other_less = True
 
+            if self_less and other_less:
+                return 0  # concurrent
+
+        # Keys only the other clock has count as 0 on our side
+        for key, other_value in other_clock.items():
+            if key not in self_clock and other_value > 0:
+                self_less = True
+                if other_less:
+                    return 0  # concurrent
+
         if self_less and not other_less:
             return -1  # self < other
         elif other_less and not self_less:
@@ -1,213 +1,243 @@
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any
 from chord.node import Node
+from config import Config
+from collections import Counter, deque
+from itertools import islice
+import bisect
+import hashlib
 import time
 
 class Simulator:
-    def __init__(self, m=8):
+    # Event log messages, formatted from an entry's fields when it is read
+    EVENT_MESSAGES = {
+        'node_join': "Node {node_id} joined at {address}.",
+        'key_redistribution': "Redistributed {count} key(s) to node {node_id}.",
+        'node_leave': "Node {node_id} left the ring.",
+        'node_offline': "Node {node_id} went offline.",
+        'node_online': "Node {node_id} came back online.",
+        'hinted_handoff': "Node {node_id} recovered with hinted handoffs.",
+        'put_success': "Stored key '{key}' = '{value}' on {count} nodes (hash: {hash}).",
+        'put_failure': "Failed to meet write quorum for key '{key}'.",
+        'get_success': "Retrieved key '{key}' = '{value}' (hash: {hash}).",
+        'get_partial': "Retrieved key '{key}' but did not meet read quorum.",
+        'get_failure': "Key '{key}' not found.",
+    }
+
+    def __init__(self, m=8, log_events=True):
         """
         Initialize the Chord DHT simulator.
         m: Number of bits in the hash space (default 8, meaning 0-255 range)
+        log_events: Record operations in the event log (disable for bulk runs)
         """
         self.m = m
         self.ring_size = 2 ** m
-        self.nodes = {}  # node_id -> Node object
-        self.event_log = []
+        self.nodes: Dict[int, Node] = {}  # node_id -> Node object
+        self._sorted_ids: List[int] = []  # node ids kept sorted for bisect lookups
+        self.event_log = deque(maxlen=Config.EVENT_LOG_SIZE)
+        self._log_enabled = log_events
         self.replication_factor = 3
-        self.hinted_handoffs = {}  # node_id -> {key: (value, target_node)}
+        self._online_ids: set = set()  # ids of nodes currently online
+        self.version = 0  # bumped on every change to nodes or their storage
+        self.hinted_handoffs = {}  # node_id -> {key: (value, primary_node_id)}
+        self._hash_cache: Dict[str, int] = {}  # key -> ring position
+        self._key_index: Dict[int, set] = {}  # key hash -> keys stored under it
+        self._key_hashes: List[int] = []  # sorted keys of _key_index for arc queries
+        self._replica_sets: Dict[int, tuple] = {}  # primary id -> replica ids, reset on join/leave
         
     def _hash(self, key: str) -> int:
-        """Hash a key to an integer in the ring space using simple modulo."""
-        # Try to convert key to integer, if it fails use ord() of first char
-        try:
-            key_int = int(key)
-        except ValueError:
-            # For non-numeric keys, use the sum of character codes
-            key_int = sum(ord(c) for c in key)
-        return key_int % self.ring_size
+        """Hash a key to an integer in the ring space (cached per key)."""
+        key_hash = self._hash_cache.get(key)
+        if key_hash is None:
+            if key.isdecimal():
+                key_int = int(key)
+            else:
+                # Non-numeric keys get a real hash; a character sum collides on anagrams
+                key_int = int.from_bytes(
+                    hashlib.blake2b(key.encode(), digest_size=4).digest(), 'big')
+            # ring_size is a power of two, so masking is equivalent to modulo
+            key_hash = key_int & (self.ring_size - 1)
+            self._hash_cache[key] = key_hash
+        return key_hash
     
     def _get_sorted_node_ids(self) -> List[int]:
         """Get all node IDs sorted in ascending order."""
-        return sorted([int(nid) for nid in self.nodes.keys()])
+        return self._sorted_ids
     
     def _find_successor(self, key_hash: int) -> Optional[int]:
         """Find the successor node for a given key hash."""
-        sorted_ids = self._get_sorted_node_ids()
+        sorted_ids = self._sorted_ids
         if not sorted_ids:
             return None
         
-        for node_id in sorted_ids:
-            if node_id >= key_hash:
-                return node_id
-        # Wrap around to the first node
-        return sorted_ids[0]
+        # First node with id >= key_hash, wrapping around to the first node
+        idx = bisect.bisect_left(sorted_ids, key_hash)
+        return sorted_ids[idx % len(sorted_ids)]
     
-    def _get_replicas(self, primary_node_id: int, count: int = None) -> List[int]:
-        """Get the list of replica nodes (successors)."""
-        if count is None:
-            count = self.replication_factor
-        
-        sorted_ids = self._get_sorted_node_ids()
-        if not sorted_ids:
-            return []
-        
-        replicas = []
+    def _log_event(self, event_type: str, **fields):
+        """Append an event log entry; its message is formatted when read."""
+        if self._log_enabled:
+            entry = {'timestamp': time.time(), 'type': event_type}
+            entry.update(fields)
+            self.event_log.append(entry)
+    
+    @staticmethod
+    def _parse_node_id(node_id) -> Optional[int]:
+        """Convert a node id from the API to the integer key used in self.nodes."""
         try:
-            idx = sorted_ids.index(primary_node_id)
-            for i in range(1, count):
-                replicas.append(sorted_ids[(idx + i) % len(sorted_ids)])
-        except ValueError:
-            pass
+            return int(node_id)
+        except (TypeError, ValueError):
+            return None
+    
+    def _index_key(self, key: str, key_hash: int):
+        """Record a key under its hash so topology changes can find it by ring arc."""
+        keys = self._key_index.get(key_hash)
+        if keys is None:
+            keys = self._key_index[key_hash] = set()
+            bisect.insort(self._key_hashes, key_hash)
+        keys.add(key)
+    
+    def _keys_in_arc(self, start: int, end: int) -> List[str]:
+        """Get all indexed keys whose hash falls in the ring arc (start, end]."""
+        hashes = self._key_hashes
+        lo = bisect.bisect_right(hashes, start)
+        hi = bisect.bisect_right(hashes, end)
+        if start < end:
+            buckets = hashes[lo:hi]
+        else:
+            # Arc wraps past the top of the ring
+            buckets = hashes[lo:] + hashes[:hi]
+        return [key for key_hash in buckets for key in self._key_index[key_hash]]
+    
+    def _iter_replicas(self, primary_node_id: int, count: int) -> Iterator[int]:
+        """Yield the ids of the count nodes succeeding the primary on the ring."""
+        sorted_ids = self._sorted_ids
+        idx = bisect.bisect_left(sorted_ids, primary_node_id)
+        if idx == len(sorted_ids) or sorted_ids[idx] != primary_node_id:
+            return
         
-        return replicas
+        n = len(sorted_ids)
+        for i in range(1, count + 1):
+            yield sorted_ids[(idx + i) % n]
+
+    def _replica_set(self, primary_node_id: int) -> tuple:
+        """Get the primary followed by its replicas (cached until the ring changes)."""
+        replica_set = self._replica_sets.get(primary_node_id)
+        if replica_set is None:
+            replica_set = (primary_node_id,) + tuple(
+                self._iter_replicas(primary_node_id, self.replication_factor - 1))
+            self._replica_sets[primary_node_id] = replica_set
+        return replica_set
 
     def join_node(self, node_id: str, address: str = None):
         """Add a new node to the ring."""
         node_id_int = int(node_id)
         
-        if node_id in self.nodes:
-            self.event_log.append({
-                'timestamp': time.time(),
-                'type': 'error',
-                'message': f"Node {node_id} already exists."
-            })
+        if node_id_int in self.nodes:
+            self._log_event('error', message=f"Node {node_id} already exists.")
             return False
         
         if address is None:
             address = f"127.0.0.1:{5000 + node_id_int}"
         
-        self.nodes[node_id] = Node(node_id_int, address)
-        self.event_log.append({
-            'timestamp': time.time(),
-            'type': 'node_join',
-            'node_id': node_id,
-            'message': f"Node {node_id} joined at {address}."
-        })
+        self.nodes[node_id_int] = Node(node_id_int, address)
+        bisect.insort(self._sorted_ids, node_id_int)
+        self._replica_sets.clear()
+        self._online_ids.add(node_id_int)
+        self.version += 1
+        self._log_event('node_join', node_id=node_id, address=address)
         
         # Redistribute keys if necessary
         self._redistribute_keys(node_id_int)
         
-        # Update replicas for existing keys
-        self._update_all_replicas()
+        # Update replicas for keys whose replica set now includes the new node
+        self._update_replicas_in_arc(self._replica_arc_start(node_id_int), node_id_int)
         
         return True
 
     def _redistribute_keys(self, new_node_id: int):
         """Redistribute keys to the new node if they belong to it."""
         sorted_ids = self._get_sorted_node_ids()
-        if len(sorted_ids) <= 1:
+        n = len(sorted_ids)
+        if n <= 1:
             return
         
-        new_node = self.nodes[str(new_node_id)]
+        new_node = self.nodes[new_node_id]
+        idx = bisect.bisect_left(sorted_ids, new_node_id)
+        predecessor_id = sorted_ids[idx - 1]
+        # Only keys hashing into (predecessor, new node] change successor. Stale
+        # copies can sit past their replica set, so every other node is checked,
+        # walking back towards the old primary so its copy is the one kept
+        holders = [self.nodes[sorted_ids[(idx - i) % n]] for i in range(1, n)]
         keys_moved = 0
         
-        # Check ALL nodes to see if any of their keys should now belong to the new node
-        for node_id_str in list(self.nodes.keys()):
-            node_id_int = int(node_id_str)
-            if node_id_int == new_node_id:
-                continue  # Skip the new node itself
-            
-            node = self.nodes[node_id_str]
-            keys_to_move = []
-            
-            # Check each key in this node
-            for key, value in list(node.key_value_store.items()):
-                key_hash = self._hash(key)
-                successor = self._find_successor(key_hash)
-                
-                # If this key's successor is now the new node, move it
-                if successor == new_node_id:
-                    keys_to_move.append((key, value))
-            
-            # Move the keys
-            for key, value in keys_to_move:
-                del node.key_value_store[key]
-                new_node.key_value_store[key] = value
-                keys_moved += 1
+        for key in self._keys_in_arc(predecessor_id, new_node_id):
+            for node in holders:
+                if key in node.key_value_store:
+                    new_node.key_value_store[key] = node.key_value_store.pop(key)
+                    keys_moved += 1
         
         if keys_moved > 0:
-            self.event_log.append({
-                'timestamp': time.time(),
-                'type': 'key_redistribution',
-                'node_id': str(new_node_id),
-                'message': f"Redistributed {keys_moved} key(s) to node {new_node_id}."
-            })
+            self._log_event('key_redistribution', node_id=str(new_node_id), count=keys_moved)
 
     def leave_node(self, node_id: str):
         """Remove a node from the ring permanently."""
-        if node_id not in self.nodes:
-            self.event_log.append({
-                'timestamp': time.time(),
-                'type': 'error',
-                'message': f"Node {node_id} does not exist."
-            })
+        node_id_int = self._parse_node_id(node_id)
+        if node_id_int not in self.nodes:
+            self._log_event('error', message=f"Node {node_id} does not exist.")
             return False
         
         # Transfer keys to successor before removal
-        node = self.nodes[node_id]
-        successor_id = self._get_replicas(int(node_id), 1)
-        if successor_id and node.key_value_store:
-            successor_node = self.nodes[str(successor_id[0])]
+        node = self.nodes[node_id_int]
+        successor_id = next(self._iter_replicas(node_id_int, 1), None)
+        if successor_id is not None and node.key_value_store:
+            successor_node = self.nodes[successor_id]
             for key, value in node.key_value_store.items():
                 successor_node.key_value_store[key] = value
         
-        del self.nodes[node_id]
-        self.event_log.append({
-            'timestamp': time.time(),
-            'type': 'node_leave',
-            'node_id': node_id,
-            'message': f"Node {node_id} left the ring."
-        })
+        arc_start = self._replica_arc_start(node_id_int)
+        del self.nodes[node_id_int]
+        self._sorted_ids.pop(bisect.bisect_left(self._sorted_ids, node_id_int))
+        self._replica_sets.clear()
+        self._online_ids.discard(node_id_int)
+        self.version += 1
+        
+        # Keys the node replicated now need a replacement replica
+        self._update_replicas_in_arc(arc_start, node_id_int)
+        self._log_event('node_leave', node_id=node_id)
         return True
 
     def simulate_offline(self, node_id: str):
         """Simulate a node going offline."""
-        if node_id not in self.nodes:
-            self.event_log.append({
-                'timestamp': time.time(),
-                'type': 'error',
-                'message': f"Node {node_id} does not exist."
-            })
+        node_id_int = self._parse_node_id(node_id)
+        if node_id_int not in self.nodes:
+            self._log_event('error', message=f"Node {node_id} does not exist.")
             return False
         
-        self.nodes[node_id].go_offline()
-        self.event_log.append({
-            'timestamp': time.time(),
-            'type': 'node_offline',
-            'node_id': node_id,
-            'message': f"Node {node_id} went offline."
-        })
+        self.nodes[node_id_int].go_offline()
+        self._online_ids.discard(node_id_int)
+        self.version += 1
+        self._log_event('node_offline', node_id=node_id)
         return True
 
     def simulate_online(self, node_id: str):
         """Bring a node back online."""
-        if node_id not in self.nodes:
-            self.event_log.append({
-                'timestamp': time.time(),
-                'type': 'error',
-                'message': f"Node {node_id} does not exist."
-            })
+        node_id_int = self._parse_node_id(node_id)
+        if node_id_int not in self.nodes:
+            self._log_event('error', message=f"Node {node_id} does not exist.")
             return False
         
-        self.nodes[node_id].come_online()
+        node = self.nodes[node_id_int]
+        node.come_online()
+        self._online_ids.add(node_id_int)
+        self.version += 1
         
         # Apply hinted handoffs
-        if node_id in self.hinted_handoffs:
-            for key, (value, _) in self.hinted_handoffs[node_id].items():
-                self.nodes[node_id].key_value_store[key] = value
-            del self.hinted_handoffs[node_id]
-            self.event_log.append({
-                'timestamp': time.time(),
-                'type': 'hinted_handoff',
-                'node_id': node_id,
-                'message': f"Node {node_id} recovered with hinted handoffs."
-            })
+        if node_id_int in self.hinted_handoffs:
+            for key, (value, _) in self.hinted_handoffs.pop(node_id_int).items():
+                node.key_value_store[key] = value
+            self._log_event('hinted_handoff', node_id=node_id)
         else:
-            self.event_log.append({
-                'timestamp': time.time(),
-                'type': 'node_online',
-                'node_id': node_id,
-                'message': f"Node {node_id} came back online."
-            })
+            self._log_event('node_online', node_id=node_id)
         return True
 
     def put(self, key: str, value: Any, write_quorum: int = 2):
@@ -216,50 +246,42 @@ class Simulator:
         primary_node_id = self._find_successor(key_hash)
         
         if primary_node_id is None:
-            self.event_log.append({
-                'timestamp': time.time(),
-                'type': 'error',
-                'message': f"No nodes available to store key '{key}'."
-            })
+            self._log_event('error', message=f"No nodes available to store key '{key}'.")
             return False
         
+        self._index_key(key, key_hash)
+        self.version += 1
+        
         # Get replica nodes
-        replica_ids = [primary_node_id] + self._get_replicas(primary_node_id, self.replication_factor)
+        replica_ids = self._replica_set(primary_node_id)
+        nodes = self.nodes
+        online_ids = self._online_ids
         
         successful_writes = 0
         nodes_written = []
         
-        for node_id in replica_ids[:self.replication_factor]:
-            node = self.nodes[str(node_id)]
-            if node.is_online:
-                result = node.put(key, value)
+        for node_id in replica_ids:
+            if node_id in online_ids:
+                result = nodes[node_id].put(key, value)
                 if result:
                     successful_writes += 1
                     nodes_written.append(str(node_id))
             else:
                 # Hinted handoff - store hint for offline node
-                if str(node_id) not in self.hinted_handoffs:
-                    self.hinted_handoffs[str(node_id)] = {}
-                self.hinted_handoffs[str(node_id)][key] = (value, str(primary_node_id))
+                self.hinted_handoffs.setdefault(node_id, {})[key] = (value, primary_node_id)
         
         if successful_writes >= write_quorum:
-            self.event_log.append({
-                'timestamp': time.time(),
-                'type': 'put_success',
-                'key': key,
-                'value': value,
-                'hash': key_hash,
-                'nodes': nodes_written,
-                'message': f"Stored key '{key}' = '{value}' on {successful_writes} nodes (hash: {key_hash})."
-            })
+            self._log_event(
+                'put_success',
+                key=key,
+                value=value,
+                hash=key_hash,
+                nodes=nodes_written,
+                count=successful_writes
+            )
             return True
         else:
-            self.event_log.append({
-                'timestamp': time.time(),
-                'type': 'put_failure',
-                'key': key,
-                'message': f"Failed to meet write quorum for key '{key}'."
-            })
+            self._log_event('put_failure', key=key)
             return False
 
     def get(self, key: str, read_quorum: int = 2):
@@ -268,67 +290,42 @@ class Simulator:
         primary_node_id = self._find_successor(key_hash)
         
         if primary_node_id is None:
-            self.event_log.append({
-                'timestamp': time.time(),
-                'type': 'error',
-                'message': f"No nodes available to retrieve key '{key}'."
-            })
+            self._log_event('error', message=f"No nodes available to retrieve key '{key}'.")
             return None
         
         # Get replica nodes
-        replica_ids = [primary_node_id] + self._get_replicas(primary_node_id, self.replication_factor)
-        
-        values = {}
-        for node_id in replica_ids[:self.replication_factor]:
-            node = self.nodes[str(node_id)]
-            if node.is_online:
-                value = node.get(key)
-                if value is not None:
-                    if value not in values:
-                        values[value] = 0
-                    values[value] += 1
+        replica_ids = self._replica_set(primary_node_id)
+        
+        nodes = self.nodes
+        online_ids = self._online_ids
+        # Offline replicas never answer, so only query the online ones
+        values = Counter([value for value in (nodes[node_id].get(key) for node_id in replica_ids if node_id in online_ids)
+                          if value is not None])
         
         if not values:
-            self.event_log.append({
-                'timestamp': time.time(),
-                'type': 'get_failure',
-                'key': key,
-                'message': f"Key '{key}' not found."
-            })
+            self._log_event('get_failure', key=key)
             return None
         
         # Return the most common value
-        result_value = max(values.items(), key=lambda x: x[1])[0]
-        
-        if values[result_value] >= read_quorum:
-            self.event_log.append({
-                'timestamp': time.time(),
-                'type': 'get_success',
-                'key': key,
-                'value': result_value,
-                'hash': key_hash,
-                'message': f"Retrieved key '{key}' = '{result_value}' (hash: {key_hash})."
-            })
+        result_value, count = values.most_common(1)[0]
+        
+        if count >= read_quorum:
+            self._log_event('get_success', key=key, value=result_value, hash=key_hash)
             return result_value
         else:
-            self.event_log.append({
-                'timestamp': time.time(),
-                'type': 'get_partial',
-                'key': key,
-                'value': result_value,
-                'message': f"Retrieved key '{key}' but did not meet read quorum."
-            })
+            self._log_event('get_partial', key=key, value=result_value)
             return result_value
 
     def get_nodes(self) -> Dict:
         """Get all nodes and their states."""
         nodes_data = {}
         for node_id, node in self.nodes.items():
-            successor = self._find_successor(int(node_id))
-            replicas = self._get_replicas(int(node_id))
+            successor = self._find_successor(node_id)
+            replicas = self._iter_replicas(node_id, self.replication_factor - 1)
             
-            nodes_data[node_id] = {
-                'node_id': node_id,
+            node_id_str = str(node_id)
+            nodes_data[node_id_str] = {
+                'node_id': node_id_str,
                 'address': node.address,
                 'state': 'online' if node.is_online else 'offline',
                 'storage': dict(node.key_value_store),
@@ -340,51 +337,84 @@ class Simulator:
 
     def get_event_log(self, limit: int = 50) -> List[Dict]:
         """Get recent event log entries."""
-        return self.event_log[-limit:]
+        # Walk back from the newest entry so only the requested tail is copied
+        entries = list(islice(reversed(self.event_log), max(limit, 0)))
+        entries.reverse()
+        for entry in entries:
+            if 'message' not in entry:
+                entry['message'] = self.EVENT_MESSAGES[entry['type']].format_map(entry)
+        return entries
 
     def reset_event_log(self):
         """Clear the event log."""
-        self.event_log = []
+        self.event_log.clear()
         
     def get_ring_data(self) -> Dict:
         """Get data for ring visualization."""
-        sorted_ids = self._get_sorted_node_ids()
         return {
             'ring_size': self.ring_size,
-            'node_ids': sorted_ids,
+            'node_ids': list(self._sorted_ids),
             'nodes': self.get_nodes()
         }
     
-    def _update_all_replicas(self):
-        """Update replicas across all nodes after ring topology changes."""
-        # Collect all unique keys across the ring
-        all_keys = {}
-        for node_id_str, node in self.nodes.items():
-            for key, value in node.key_value_store.items():
-                if key not in all_keys:
-                    all_keys[key] = value
+    def _replica_arc_start(self, node_id: int) -> Optional[int]:
+        """
+        Get the start of the hash arc whose keys have node_id as a replica.
         
-        # For each key, ensure it's replicated correctly
-        for key, value in all_keys.items():
-            key_hash = self._hash(key)
-            primary_node_id = self._find_successor(key_hash)
-            
-            if primary_node_id is None:
-                continue
+        Keys hashing into (pred_R(node), node] are replicated on node, where
+        pred_R is the node replication_factor positions before it. Returns
+        None when the ring is small enough that every node holds every key.
+        """
+        sorted_ids = self._sorted_ids
+        if len(sorted_ids) <= self.replication_factor:
+            return None
+        idx = bisect.bisect_left(sorted_ids, node_id)
+        return sorted_ids[(idx - self.replication_factor) % len(sorted_ids)]
+    
+    def _update_replicas_in_arc(self, arc_start: Optional[int], arc_end: int):
+        """
+        Update replicas for the keys affected by a topology change.
+        
+        Only keys hashing into (arc_start, arc_end] are touched: each gets
+        its current replica set filled in, and the node just past that set
+        drops its copy. An arc_start of None means every key is affected.
+        """
+        sorted_ids = self._sorted_ids
+        n = len(sorted_ids)
+        if n == 0:
+            return
+        if arc_start is None:
+            candidate_keys = [key for keys in self._key_index.values() for key in keys]
+        else:
+            candidate_keys = self._keys_in_arc(arc_start, arc_end)
+        
+        online_ids = self._online_ids
+        nodes = self.nodes
+        bisect_left = bisect.bisect_left
+        window = min(self.replication_factor + 1, n)
+        windows = {}  # primary index -> window nodes, shared by keys on the same primary
+        for key in candidate_keys:
+            primary_idx = bisect_left(sorted_ids, self._hash(key)) % n
+            window_nodes = windows.get(primary_idx)
+            if window_nodes is None:
+                # The replica set plus the node that just fell out of it
+                window_nodes = windows[primary_idx] = [
+                    nodes[sorted_ids[(primary_idx + i) % n]] for i in range(window)]
+            replica_nodes = window_nodes[:self.replication_factor]
             
-            # Get the correct replica nodes for this key
-            replica_ids = [primary_node_id] + self._get_replicas(primary_node_id, self.replication_factor)
-            replica_ids = replica_ids[:self.replication_factor]
+            value = None
+            for node in window_nodes:
+                if key in node.key_value_store:
+                    value = node.key_value_store[key]
+                    break
+            else:
+                continue  # Key is not stored anywhere
             
             # Ensure the key exists on all replica nodes (if they're online)
-            for replica_id in replica_ids:
-                replica_node = self.nodes[str(replica_id)]
-                if replica_node.is_online and key not in replica_node.key_value_store:
+            for replica_node in replica_nodes:
+                if replica_node.node_id in online_ids and key not in replica_node.key_value_store:
                     replica_node.key_value_store[key] = value
             
-            # Remove key from nodes that shouldn't have it
-            for node_id_str, node in self.nodes.items():
-                node_id_int = int(node_id_str)
-                if node_id_int not in replica_ids and key in node.key_value_store:
-                    # Only remove if this node is not a valid replica
-                    del node.key_value_store[key]
\ No newline at end of file
+            # Remove key from the node that is no longer a valid replica
+            for node in window_nodes[self.replication_factor:]:
+                node.key_value_store.pop(key, None)
@@ -1,35 +1,125 @@
-from flask import Flask, render_template, request, jsonify
+# Run as a script, the server uses eventlet (see requirements.txt) to serve HTTP
+# and Socket.IO cooperatively on one event loop; it has to patch the standard
+# library before anything else imports it. Importing this module (tests, other
+# WSGI hosts) patches nothing and lets Flask-SocketIO pick the async mode.
+ASYNC_MODE = None
+if __name__ == '__main__':
+    try:
+        import eventlet
+        eventlet.monkey_patch()
+        ASYNC_MODE = 'eventlet'
+    except ImportError:
+        ASYNC_MODE = 'threading'
+
+from flask import Flask, render_template, request
 from flask_socketio import SocketIO, emit
 import sys
 import os
 
-# Add parent directory to path to import simulation modules
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+try:
+    import orjson
+    _dumps = orjson.dumps
+except ImportError:
+    import json
+    _dumps = json.dumps
+
+# Socket.IO packets are sent as msgpack when it is available and python-socketio
+# supports it (5.4+, where the msgpack_packet module appeared); the page loads
+# the matching client bundle (see index())
+try:
+    from socketio import msgpack_packet  # noqa: F401  (imports msgpack)
+    SOCKETIO_SERIALIZER = 'msgpack'
+except ImportError:
+    SOCKETIO_SERIALIZER = 'default'
+
+# Add parent directory to path to import simulation modules (only needed when
+# run as a script; pytest and `python -m` already have it on the path)
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
 
 from simulation.simulator import Simulator
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'chord-dht-secret'
-socketio = SocketIO(app, cors_allowed_origins="*")
+# The initial state_update on connect goes out over long-polling, where
+# Engine.IO gzips payloads above compression_threshold bytes
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode=ASYNC_MODE,
+                    serializer=SOCKETIO_SERIALIZER,
+                    http_compression=True, compression_threshold=512)
 
 # Initialize simulator
 simulator = Simulator(m=8)
 
+def _json_response(obj, status=200):
+    """Encode obj as a JSON response (with orjson when it is installed)."""
+    return app.response_class(_dumps(obj), status=status, mimetype='application/json')
+
+# Snapshots of simulator state, reused until simulator.version changes
+_snapshot_cache = {}  # name -> (simulator version, value)
+
+def _snapshot(name, build):
+    """Return build()'s result, recomputing it only after the simulator changes."""
+    cached = _snapshot_cache.get(name)
+    if cached is None or cached[0] != simulator.version:
+        cached = _snapshot_cache[name] = (simulator.version, build())
+    return cached[1]
+
+def _nodes_snapshot():
+    return _snapshot('nodes', simulator.get_nodes)
+
+def _state_payload(log_limit):
+    return {'nodes': _nodes_snapshot(), 'log': simulator.get_event_log(log_limit)}
+
+# Broadcasts are coalesced: the first request for an event schedules a single
+# emit after its interval, and requests arriving meanwhile ride along with it
+STATE_UPDATE_INTERVAL = 1 / 30  # seconds
+LOG_UPDATE_INTERVAL = 0.1  # seconds
+_pending_broadcasts = set()
+
+def _schedule_broadcast(event, build_payload, interval):
+    if event not in _pending_broadcasts:
+        _pending_broadcasts.add(event)
+        socketio.start_background_task(_flush_broadcast, event, build_payload, interval)
+
+def _flush_broadcast(event, build_payload, interval):
+    socketio.sleep(interval)
+    _pending_broadcasts.discard(event)
+    socketio.emit(event, build_payload())
+
+def _broadcast_state():
+    """Send nodes and recent log to all clients, at most once per STATE_UPDATE_INTERVAL."""
+    _schedule_broadcast('state_update', lambda: _state_payload(10), STATE_UPDATE_INTERVAL)
+
+def _schedule_log_update():
+    """Broadcast the event log once per LOG_UPDATE_INTERVAL at most."""
+    _schedule_broadcast('log_update', lambda: {'log': simulator.get_event_log(10)},
+                        LOG_UPDATE_INTERVAL)
+
+def _cached_response(name, build):
+    """Serve a JSON body that is encoded once per simulator version."""
+    body = _snapshot(name + '_json', lambda: _dumps(build()))
+    return app.response_class(body, mimetype='application/json')
+
+_index_html = None  # rendered page; its inputs do not change while the server runs
+
 @app.route('/')
 def index():
-    return render_template('index.html')
+    global _index_html
+    # Re-render in debug mode so template edits still show up on reload
+    if _index_html is None or app.debug:
+        _index_html = render_template('index.html', msgpack=SOCKETIO_SERIALIZER == 'msgpack')
+    return _index_html
 
 @app.route('/api/nodes', methods=['GET'])
 def get_nodes():
     """Get all nodes and their states."""
-    nodes = simulator.get_nodes()
-    return jsonify({'status': 'success', 'nodes': nodes})
+    return _cached_response('nodes', lambda: {'status': 'success', 'nodes': _nodes_snapshot()})
 
 @app.route('/api/ring', methods=['GET'])
 def get_ring():
     """Get ring visualization data."""
-    ring_data = simulator.get_ring_data()
-    return jsonify({'status': 'success', 'ring': ring_data})
+    return _cached_response('ring', lambda: {'status': 'success', 'ring': simulator.get_ring_data()})
 
 @app.route('/api/node/join', methods=['POST'])
 def join_node():
@@ -42,11 +132,42 @@ def join_node():
     
     if result:
         # Broadcast update to all clients
-        socketio.emit('node_update', {'nodes': simulator.get_nodes()})
-        socketio.emit('log_update', {'log': simulator.get_event_log(10)})
-        return jsonify({'status': 'success', 'message': f'Node {node_id} joined.'})
+        _broadcast_state()
+        return _json_response({'status': 'success', 'message': f'Node {node_id} joined.'})
     else:
-        return jsonify({'status': 'error', 'message': f'Failed to join node {node_id}.'}), 400
+        return _json_response({'status': 'error', 'message': f'Failed to join node {node_id}.'}, 400)
+
+@app.route('/api/nodes/join_bulk', methods=['POST'])
+def join_nodes_bulk():
+    """Add several nodes to the ring with a single broadcast."""
+    data = request.get_json(silent=True)
+    entries = data.get('nodes') if isinstance(data, dict) else None
+    if not isinstance(entries, list):
+        return _json_response({'status': 'error', 'message': '"nodes" must be a list.'}, 400)
+    
+    joined, failed = [], []
+    for entry in entries:
+        # Entries are either bare node ids or {'node_id': ..., 'address': ...}
+        if isinstance(entry, dict):
+            node_id, address = entry.get('node_id'), entry.get('address')
+        else:
+            node_id, address = entry, None
+        try:
+            int(str(node_id))
+        except ValueError:
+            failed.append({'node_id': node_id, 'reason': 'node_id must be an integer'})
+            continue
+        node_id = str(node_id)
+        if simulator.join_node(node_id, address):
+            joined.append(node_id)
+        else:
+            failed.append({'node_id': node_id, 'reason': 'node already exists'})
+    
+    if joined:
+        _broadcast_state()
+    status = 200 if joined or not failed else 400
+    return _json_response({'status': 'success' if status == 200 else 'error',
+                           'joined': joined, 'failed': failed}, status)
 
 @app.route('/api/node/leave', methods=['POST'])
 def leave_node():
@@ -57,11 +178,10 @@ def leave_node():
     result = simulator.leave_node(node_id)
     
     if result:
-        socketio.emit('node_update', {'nodes': simulator.get_nodes()})
-        socketio.emit('log_update', {'log': simulator.get_event_log(10)})
-        return jsonify({'status': 'success', 'message': f'Node {node_id} left.'})
+        _broadcast_state()
+        return _json_response({'status': 'success', 'message': f'Node {node_id} left.'})
     else:
-        return jsonify({'status': 'error', 'message': f'Failed to remove node {node_id}.'}), 400
+        return _json_response({'status': 'error', 'message': f'Failed to remove node {node_id}.'}, 400)
 
 @app.route('/api/node/offline', methods=['POST'])
 def set_node_offline():
@@ -72,11 +192,10 @@ def set_node_offline():
     result = simulator.simulate_offline(node_id)
     
     if result:
-        socketio.emit('node_update', {'nodes': simulator.get_nodes()})
-        socketio.emit('log_update', {'log': simulator.get_event_log(10)})
-        return jsonify({'status': 'success', 'message': f'Node {node_id} is now offline.'})
+        _broadcast_state()
+        return _json_response({'status': 'success', 'message': f'Node {node_id} is now offline.'})
     else:
-        return jsonify({'status': 'error', 'message': f'Failed to set node {node_id} offline.'}), 400
+        return _json_response({'status': 'error', 'message': f'Failed to set node {node_id} offline.'}, 400)
 
 @app.route('/api/node/online', methods=['POST'])
 def set_node_online():
@@ -87,78 +206,136 @@ def set_node_online():
     result = simulator.simulate_online(node_id)
     
     if result:
-        socketio.emit('node_update', {'nodes': simulator.get_nodes()})
-        socketio.emit('log_update', {'log': simulator.get_event_log(10)})
-        return jsonify({'status': 'success', 'message': f'Node {node_id} is now online.'})
+        _broadcast_state()
+        return _json_response({'status': 'success', 'message': f'Node {node_id} is now online.'})
     else:
-        return jsonify({'status': 'error', 'message': f'Failed to bring node {node_id} online.'}), 400
+        return _json_response({'status': 'error', 'message': f'Failed to bring node {node_id} online.'}, 400)
 
-@app.route('/api/put', methods=['POST'])
-def put_key_value():
-    """Store a key-value pair."""
-    data = request.json
+def _put(data):
+    """Store a key-value pair; returns the response payload and HTTP status."""
     key = data.get('key')
     value = data.get('value')
     write_quorum = data.get('write_quorum', 2)
     
     if not key or value is None:
-        return jsonify({'status': 'error', 'message': 'Key and value are required.'}), 400
+        return {'status': 'error', 'message': 'Key and value are required.'}, 400
     
     result = simulator.put(key, value, write_quorum)
     
     if result:
-        socketio.emit('node_update', {'nodes': simulator.get_nodes()})
-        socketio.emit('log_update', {'log': simulator.get_event_log(10)})
-        return jsonify({'status': 'success', 'message': f'Key "{key}" stored successfully.'})
+        _broadcast_state()
+        return {'status': 'success', 'message': f'Key "{key}" stored successfully.'}, 200
     else:
-        return jsonify({'status': 'error', 'message': f'Failed to store key "{key}".'}), 400
+        return {'status': 'error', 'message': f'Failed to store key "{key}".'}, 400
 
-@app.route('/api/get', methods=['GET'])
-def get_value():
-    """Retrieve a value by key."""
-    key = request.args.get('key')
-    read_quorum = int(request.args.get('read_quorum', 2))
-    
+def _get(key, read_quorum):
+    """Retrieve a value by key; returns the response payload and HTTP status."""
     if not key:
-        return jsonify({'status': 'error', 'message': 'Key is required.'}), 400
+        return {'status': 'error', 'message': 'Key is required.'}, 400
     
     value = simulator.get(key, read_quorum)
     
-    socketio.emit('log_update', {'log': simulator.get_event_log(10)})
+    _schedule_log_update()
     
     if value is not None:
-        return jsonify({'status': 'success', 'key': key, 'value': value})
+        return {'status': 'success', 'key': key, 'value': value}, 200
     else:
-        return jsonify({'status': 'error', 'key': key, 'message': 'Key not found.'}), 404
+        return {'status': 'error', 'key': key, 'message': 'Key not found.'}, 404
+
+@app.route('/api/put', methods=['POST'])
+def put_key_value():
+    """Store a key-value pair."""
+    return _json_response(*_put(request.json))
+
+@app.route('/api/puts', methods=['POST'])
+def put_key_values_bulk():
+    """Store several key-value pairs with a single broadcast."""
+    data = request.get_json(silent=True)
+    items = data.get('items') if isinstance(data, dict) else None
+    if not isinstance(items, list):
+        return _json_response({'status': 'error', 'message': '"items" must be a list.'}, 400)
+    
+    write_quorum = data.get('write_quorum', 2)
+    stored, failed = [], []
+    for item in items:
+        if not isinstance(item, dict):
+            failed.append({'key': None, 'reason': 'item must be an object'})
+            continue
+        key = item.get('key')
+        value = item.get('value')
+        if not isinstance(key, str) or not key or value is None:
+            failed.append({'key': key, 'reason': 'key (a non-empty string) and value are required'})
+        elif simulator.put(key, value, write_quorum):
+            stored.append(key)
+        else:
+            failed.append({'key': key, 'reason': 'no nodes available'})
+    
+    if stored:
+        _broadcast_state()
+    status = 200 if stored or not failed else 400
+    return _json_response({'status': 'success' if status == 200 else 'error',
+                           'stored': stored, 'failed': failed}, status)
+
+@app.route('/api/get', methods=['GET'])
+def get_value():
+    """Retrieve a value by key."""
+    read_quorum = int(request.args.get('read_quorum', 2))
+    return _json_response(*_get(request.args.get('key'), read_quorum))
 
 @app.route('/api/events', methods=['GET'])
 def get_events():
     """Get recent event log entries."""
     limit = int(request.args.get('limit', 50))
     events = simulator.get_event_log(limit)
-    return jsonify({'status': 'success', 'events': events})
+    return _json_response({'status': 'success', 'events': events})
 
 @app.route('/api/events/clear', methods=['POST'])
 def clear_events():
     """Clear the event log."""
     simulator.reset_event_log()
     socketio.emit('log_update', {'log': []})
-    return jsonify({'status': 'success', 'message': 'Event log cleared.'})
+    return _json_response({'status': 'success', 'message': 'Event log cleared.'})
 
 # WebSocket events
 @socketio.on('connect')
 def handle_connect():
     """Handle client connection."""
-    emit('node_update', {'nodes': simulator.get_nodes()})
-    emit('log_update', {'log': simulator.get_event_log(20)})
+    emit('state_update', _state_payload(20))
 
 @socketio.on('request_update')
 def handle_update_request():
     """Handle manual update request from client."""
-    emit('node_update', {'nodes': simulator.get_nodes()})
-    emit('log_update', {'log': simulator.get_event_log(20)})
+    emit('state_update', _state_payload(20))
+
+# Key operations over the open socket; the return value is sent as the ack
+@socketio.on('put')
+def handle_put(data):
+    """Store a key-value pair without an HTTP round trip."""
+    return _put(data)[0]
+
+@socketio.on('get')
+def handle_get(data):
+    """Retrieve a value by key without an HTTP round trip."""
+    return _get(data.get('key'), int(data.get('read_quorum', 2)))[0]
 
 if __name__ == '__main__':
     print("Starting Chord DHT Simulation Server...")
     print("Access the simulation at: http://localhost:5000")
-    socketio.run(app, debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    print(f"Async mode: {ASYNC_MODE}")
+    debug = True
+    if ASYNC_MODE == 'eventlet':
+        import socket
+        from eventlet import wsgi
+        from werkzeug.debug import DebuggedApplication
+        # Socket.IO traffic is a stream of small frames (state/log broadcasts,
+        # put/get acks); with Nagle enabled a frame written while an earlier one
+        # is still unACKed is held back. Accepted connections inherit
+        # TCP_NODELAY from the listening socket.
+        listener = eventlet.listen(('0.0.0.0', 5000))
+        listener.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        # Same debug behaviour as socketio.run(debug=True): template
+        # re-rendering in index() and the interactive debugger
+        app.debug = debug
+        wsgi.server(listener, DebuggedApplication(app, evalex=True) if debug else app)
+    else:
+        socketio.run(app, debug=debug, host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -32,13 +32,10 @@ function initializeWebSocket() {
         addLogEntry('Connected to simulation server', 'info');
     });
     
-    socket.on('node_update', function(data) {
-        nodes = data.nodes;
-        updateNodesList();
-        updateRingVisualization();
-        if (selectedNodeId && nodes[selectedNodeId]) {
-            updateNodeDetails(selectedNodeId);
-        }
+    // Nodes and log arrive together after every change to the ring
+    socket.on('state_update', function(data) {
+        applyNodeUpdate(data.nodes);
+        updateEventLog(data.log);
     });
     
     socket.on('log_update', function(data) {
@@ -46,6 +43,20 @@ function initializeWebSocket() {
     });
 }
 
+function applyNodeUpdate(updatedNodes) {
+    nodes = updatedNodes;
+    updateNodesList();
+    updateRingVisualization();
+    if (selectedNodeId && nodes[selectedNodeId]) {
+        updateNodeDetails(selectedNodeId);
+    }
+}
+
+// Send a request over the open socket and resolve with the server's ack
+function socketRequest(event, payload) {
+    return new Promise(resolve => socket.emit(event, payload, resolve));
+}
+
 async function loadInitialData() {
     try {
         const response = await fetch('/api/nodes');
@@ -148,13 +159,7 @@ async function handlePut() {
     }
     
     try {
-        const response = await fetch('/api/put', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ key, value })
-        });
-        
-        const data = await response.json();
+        const data = await socketRequest('put', { key, value });
         if (data.status === 'success') {
             document.getElementById("key-input").value = '';
             document.getElementById("value-input").value = '';
@@ -177,8 +182,7 @@ async function handleGet() {
     }
     
     try {
-        const response = await fetch(`/api/get?key=${encodeURIComponent(key)}`);
-        const data = await response.json();
+        const data = await socketRequest('get', { key });
         
         if (data.status === 'success') {
             document.getElementById("value-input").value = data.value;
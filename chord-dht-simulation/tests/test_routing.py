@@ -0,0 +1,29 @@
+import unittest
+from chord.routing import Routing
+
+
+class TestRouting(unittest.TestCase):
+
+    def setUp(self):
+        # Ring [10, 20, 30, 40] linked through successor pointers only
+        self.nodes = {node_id: Routing(node_id, f"127.0.0.1:{5000 + node_id}")
+                      for node_id in (10, 20, 30, 40)}
+        ids = sorted(self.nodes)
+        for i, node_id in enumerate(ids):
+            self.nodes[node_id].successor = self.nodes[ids[(i + 1) % len(ids)]]
+
+    def test_find_successor_with_empty_finger_table(self):
+        self.assertEqual(self.nodes[10].find_successor(35).node_id, 40)
+        self.assertEqual(self.nodes[10].find_successor(20).node_id, 20)
+        self.assertEqual(self.nodes[30].find_successor(5).node_id, 10)
+        self.assertEqual(self.nodes[40].find_successor(250).node_id, 10)
+
+    def test_find_successor_with_partial_finger_table(self):
+        self.nodes[10].update_finger_table(self.nodes[30], 4)
+        self.assertEqual(self.nodes[10].find_successor(35).node_id, 40)
+        self.assertEqual(self.nodes[10].find_successor(25).node_id, 30)
+        self.assertEqual(self.nodes[10].find_successor(45).node_id, 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,15 @@
 import unittest
+from simulation.simulator import Simulator
+from simulation.visualization import server
 from simulation.visualization.server import app
 
 class TestVisualization(unittest.TestCase):
 
-    def setUp(self):
-        self.app = app.test_client()
-        self.app.testing = True
+    @classmethod
+    def setUpClass(cls):
+        # One client serves every test; the Flask app itself is stateless here
+        app.testing = True
+        cls.app = app.test_client()
 
     def test_index_page(self):
         response = self.app.get('/')
@@ -32,5 +36,60 @@ class TestVisualization(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIn(b'Event Log', response.data)
 
+class TestBulkEndpoints(unittest.TestCase):
+
+    def setUp(self):
+        app.testing = True
+        self.app = app.test_client()
+        # Each test gets an empty ring
+        self._simulator = server.simulator
+        server.simulator = Simulator(m=8)
+
+    def tearDown(self):
+        server.simulator = self._simulator
+
+    def test_join_bulk_reports_each_failure(self):
+        response = self.app.post('/api/nodes/join_bulk', json={'nodes': [
+            10, {'node_id': 20, 'address': '127.0.0.1:6020'}, 'abc', {'address': 'x'}, 10]})
+        self.assertEqual(response.status_code, 200)
+        body = response.get_json()
+        self.assertEqual(body['joined'], ['10', '20'])
+        self.assertEqual([f['node_id'] for f in body['failed']], ['abc', None, '10'])
+        self.assertTrue(all(f['reason'] for f in body['failed']))
+        self.assertEqual(sorted(server.simulator.nodes), [10, 20])
+
+    def test_join_bulk_all_failed(self):
+        response = self.app.post('/api/nodes/join_bulk', json={'nodes': ['abc']})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()['failed'][0]['node_id'], 'abc')
+
+    def test_join_bulk_rejects_non_list(self):
+        for body in ({'nodes': 'abc'}, {}, [1, 2]):
+            response = self.app.post('/api/nodes/join_bulk', json=body)
+            self.assertEqual(response.status_code, 400)
+        response = self.app.post('/api/nodes/join_bulk', data='not json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_puts_reports_each_failure(self):
+        self.app.post('/api/nodes/join_bulk', json={'nodes': [10, 100, 200]})
+        response = self.app.post('/api/puts', json={'items': [
+            {'key': 'a', 'value': 1}, 'junk', {'key': 'b'}, {'value': 2}, {'key': 'c', 'value': 'x'}]})
+        self.assertEqual(response.status_code, 200)
+        body = response.get_json()
+        self.assertEqual(body['stored'], ['a', 'c'])
+        self.assertEqual([f['key'] for f in body['failed']], [None, 'b', None])
+        self.assertTrue(all(f['reason'] for f in body['failed']))
+        self.assertEqual(server.simulator.get('a'), 1)
+
+    def test_puts_without_nodes(self):
+        response = self.app.post('/api/puts', json={'items': [{'key': 'a', 'value': 1}]})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()['failed'], [{'key': 'a', 'reason': 'no nodes available'}])
+
+    def test_puts_rejects_non_list(self):
+        for body in ({'items': {'key': 'a'}}, {}, 'x'):
+            response = self.app.post('/api/puts', json=body)
+            self.assertEqual(response.status_code, 400)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
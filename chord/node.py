@@ -4,10 +4,13 @@ Core Chord node implementation.
 
 import asyncio
 import logging
+import time
+from collections import OrderedDict
 from typing import Optional, List
 from .routing import FingerTable, NodeInfo, hash_address, in_range
 from .storage import ChordStorage, hash_key
-from consistency.vector_clock import VectorClock
+from communication.message import Message, MessageType
+from consistency.vector_clock import VectorClock, compare_and_merge
 
 
 class ChordNode:
@@ -21,6 +24,16 @@ class ChordNode:
     - Successor list for replication
     """
     
+    SUCCESSOR_CACHE_SIZE = 128  # find_successor results kept per node
+    SUCCESSOR_LIST_SEED_TTL = 3.0  # seconds a join-seeded successor list is trusted
+    
+    __slots__ = ('address', 'm', 'max_id', '_ring_mask', 'n_replicas', 'node_id', 'logger',
+                 'finger_table', 'successor_list', 'storage', 'next_finger_to_fix',
+                 '_self_info', '_self_info_dict', '_predecessor', '_predecessor_version',
+                 '_successor_cache', '_successor_cache_stamp', '_finger_mask',
+                 '_successor_list_fresh_until',
+                 '_background_tasks')
+    
     def __init__(self, address: str, m: int = 6, n_replicas: int = 3):
         """
         Initialize a Chord node.
@@ -33,20 +46,38 @@ class ChordNode:
         self.address = address
         self.m = m
         self.max_id = 2 ** m
+        # Ring arithmetic mod 2^m as a bit mask (see find_successor and notify)
+        self._ring_mask = self.max_id - 1
         self.n_replicas = n_replicas
         
         # Compute node identifier from address
         self.node_id = hash_address(address, m)
+        # Shared NodeInfo describing this node (see get_info); never mutate it
+        self._self_info = NodeInfo(self.node_id, address)
+        # Payload form of the same, sent with NOTIFY and BROADCAST_JOIN; read-only
+        self._self_info_dict = {'node_id': self.node_id, 'address': address}
         
         # Logging - initialize EARLY so we can use it
         self.logger = logging.getLogger(f"ChordNode-{self.node_id}")
-        self.logger.info(f"Initializing node {self.node_id} at {address}")
+        self.logger.info("Initializing node %s at %s", self.node_id, address)
         
         # Routing structures
         self.finger_table = FingerTable(self.node_id, m)
-        self.predecessor: Optional[NodeInfo] = None
+        self._predecessor: Optional[NodeInfo] = None
+        self._predecessor_version = 0
         self.successor_list: List[NodeInfo] = []
         
+        # One-way sends still in flight; referenced here so they are not garbage collected
+        self._background_tasks: set = set()
+        
+        # time.monotonic() until which successor_list, seeded from full ring
+        # knowledge on join, is used without asking the successor again
+        self._successor_list_fresh_until = 0.0
+        
+        # Recent find_successor results, valid while the routing state is unchanged
+        self._successor_cache: OrderedDict = OrderedDict()  # identifier -> NodeInfo
+        self._successor_cache_stamp = None
+        
         # Local storage with persistent storage enabled
         self.storage = ChordStorage(self.node_id, base_dir="storage", enable_persistence=True)
         
@@ -54,16 +85,27 @@ class ChordNode:
         primary_count = self.storage.load_all_primary()
         backup_count = self.storage.load_all_backups()
         if primary_count > 0 or backup_count > 0:
-            self.logger.info(f"Loaded {primary_count} primary keys and {backup_count} backup keys from disk")
+            self.logger.info("Loaded %s primary keys and %s backup keys from disk", primary_count, backup_count)
         
         # Stabilization state
         self.next_finger_to_fix = 0
+        # Wrap mask for next_finger_to_fix when m is a power of two, else None
+        self._finger_mask = m - 1 if m & (m - 1) == 0 else None
         
-        self.logger.info(f"Node initialization complete")
+        self.logger.info("Node initialization complete")
     
     def get_info(self) -> NodeInfo:
-        """Get NodeInfo for this node."""
-        return NodeInfo(self.node_id, self.address)
+        """Get NodeInfo for this node (the same instance on every call)."""
+        return self._self_info
+    
+    @property
+    def predecessor(self) -> Optional[NodeInfo]:
+        return self._predecessor
+    
+    @predecessor.setter
+    def predecessor(self, node: Optional[NodeInfo]):
+        self._predecessor = node
+        self._predecessor_version += 1
     
     # ==================== Core Chord Operations ====================
     
@@ -71,12 +113,31 @@ class ChordNode:
         """
         Find the successor node responsible for an identifier.
         
+        Results are cached (LRU) until the finger table or predecessor changes.
+        
         Args:
             identifier: The identifier to look up
             
         Returns:
             NodeInfo of the successor node
         """
+        cache = self._successor_cache
+        stamp = (self.finger_table.version, self._predecessor_version)
+        if stamp != self._successor_cache_stamp:
+            cache.clear()
+            self._successor_cache_stamp = stamp
+        elif identifier in cache:
+            cache.move_to_end(identifier)
+            return cache[identifier]
+        
+        result = self._find_successor_uncached(identifier)
+        cache[identifier] = result
+        if len(cache) > self.SUCCESSOR_CACHE_SIZE:
+            cache.popitem(last=False)
+        return result
+    
+    def _find_successor_uncached(self, identifier: int) -> Optional[NodeInfo]:
+        """Resolve the successor for an identifier from the current routing state."""
         # If we're the only node, we're responsible
         if not self.finger_table.get_successor():
             return self.get_info()
@@ -87,16 +148,21 @@ class ChordNode:
         if successor.node_id == self.node_id:
             return self.get_info()
         
+        # x in (a, b] on the ring is ((x - a - 1) & mask) <= ((b - a - 1) & mask);
+        # a == b covers the whole ring, matching in_range
+        mask = self._ring_mask
+        node_id = self.node_id
+        
         # Check if identifier is between us and our successor (we should return successor)
-        if in_range(identifier, self.node_id, successor.node_id, 
-                   inclusive_start=False, inclusive_end=True):
+        if (identifier - node_id - 1) & mask <= (successor.node_id - node_id - 1) & mask:
             return successor
         
         # Check if we are responsible (identifier is between predecessor and us)
-        if self.predecessor:
-            if in_range(identifier, self.predecessor.node_id, self.node_id,
-                       inclusive_start=False, inclusive_end=True):
-                return self.get_info()
+        predecessor = self._predecessor
+        if predecessor:
+            pred_id = predecessor.node_id
+            if (identifier - pred_id - 1) & mask <= (node_id - pred_id - 1) & mask:
+                return self._self_info
         
         # Find closest preceding node from our finger table/successor list
         closest = self.find_closest_preceding_node(identifier)
@@ -148,7 +214,8 @@ class ChordNode:
         #     successor = x
         # successor.notify(self)
         
-        self.logger.debug(f"Stabilize: successor={successor}")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Stabilize: successor=%s", successor)
     
     def notify(self, node: NodeInfo):
         """
@@ -159,26 +226,40 @@ class ChordNode:
         """
         if self.predecessor is None:
             self.predecessor = node
-        elif in_range(node.node_id, self.predecessor.node_id, self.node_id,
-                     inclusive_start=False, inclusive_end=False):
+        elif self._between_predecessor_and_self(node.node_id):
             # node is between our current predecessor and us
             self.predecessor = node
-            self.logger.info(f"Updated predecessor to {node}")
+            self.logger.info("Updated predecessor to %s", node)
+    
+    def _between_predecessor_and_self(self, identifier: int) -> bool:
+        """in_range(identifier, predecessor, self) with both ends exclusive, on the ring mask."""
+        pred_id = self._predecessor.node_id
+        mask = self._ring_mask
+        # x in (a, b) is ((x - a - 1) & mask) < ((b - a - 1) & mask), except that
+        # in_range treats a == b as the whole ring
+        return (pred_id == self.node_id or
+                (identifier - pred_id - 1) & mask < (self.node_id - pred_id - 1) & mask)
     
     def fix_fingers(self):
         """
         Periodically refresh finger table entries.
         Called periodically to maintain correct finger table.
         """
-        # Fix the next finger
-        self.next_finger_to_fix = (self.next_finger_to_fix + 1) % self.m
+        # Fix the next finger (wrap without a division)
+        next_finger = self.next_finger_to_fix + 1
+        if self._finger_mask is not None:
+            self.next_finger_to_fix = next_finger & self._finger_mask
+        else:
+            self.next_finger_to_fix = 0 if next_finger >= self.m else next_finger
         
-        start = self.finger_table.get_start(self.next_finger_to_fix)
+        # Starts are precomputed by the finger table; index past get_start's bounds check
+        start = self.finger_table.starts[self.next_finger_to_fix]
         successor = self.find_successor(start)
         
         if successor:
             self.finger_table.set_finger(self.next_finger_to_fix, successor)
-            self.logger.debug(f"Fixed finger {self.next_finger_to_fix} -> {successor}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Fixed finger %s -> %s", self.next_finger_to_fix, successor)
     
     def check_predecessor(self):
         """
@@ -188,7 +269,7 @@ class ChordNode:
         if self.predecessor:
             # In a real implementation, ping predecessor
             # If it fails, set predecessor to None
-            self.logger.debug(f"Checking predecessor {self.predecessor}")
+            self.logger.debug("Checking predecessor %s", self.predecessor)
     
     # ==================== Join Protocol ====================
     
@@ -211,7 +292,7 @@ class ChordNode:
         self.predecessor = None
         self.finger_table.set_successor(self.get_info())
         self.successor_list = [self.get_info()]
-        self.logger.info(f"Created new Chord ring")
+        self.logger.info("Created new Chord ring")
     
     def join_ring(self, known_node: NodeInfo):
         """
@@ -227,8 +308,8 @@ class ChordNode:
         self.finger_table.set_successor(known_node)
         self.successor_list = [known_node]
         
-        self.logger.info(f"Joining ring via {known_node}")
-        self.logger.info(f"Set successor to {known_node}")
+        self.logger.info("Joining ring via %s", known_node)
+        self.logger.info("Set successor to %s", known_node)
     
     # ==================== Data Operations ====================
     
@@ -243,21 +324,25 @@ class ChordNode:
         Returns:
             True if stored successfully
         """
-        key_id = hash_key(key, self.m)
-        
-        # Check if we're responsible for this key
-        successor = self.find_successor(key_id)
+        # Alone in the ring we own every key, so skip hashing and the lookup
+        if self._am_sole_node():
+            successor = self._self_info
+        else:
+            # Check if we're responsible for this key
+            key_id = hash_key(key, self.m)
+            successor = self.find_successor(key_id)
         
         if successor and successor.node_id == self.node_id:
             # We're responsible, store it
             version = self.storage.put(key, value)
-            self.logger.info(f"Stored {key}={value} with version {version}")
+            self.storage.flush()
+            self.logger.info("Stored %s=%s with version %s", key, value, version)
             return True
         else:
             # We're not responsible, should forward to successor
             # For now, just log
-            self.logger.warning(f"Not responsible for key {key} (id={key_id}), "
-                              f"successor={successor}")
+            self.logger.warning("Not responsible for key %s (id=%s), successor=%s",
+                                key, key_id, successor)
             return False
     
     def get(self, key: str) -> Optional[any]:
@@ -270,21 +355,28 @@ class ChordNode:
         Returns:
             The value or None if not found
         """
-        key_id = hash_key(key, self.m)
-        
-        # Check if we're responsible for this key
-        successor = self.find_successor(key_id)
+        if self._am_sole_node():
+            successor = self._self_info
+        else:
+            # Check if we're responsible for this key
+            key_id = hash_key(key, self.m)
+            successor = self.find_successor(key_id)
         
         if successor and successor.node_id == self.node_id:
             # We're responsible, retrieve it
             value = self.storage.get_value(key)
-            self.logger.info(f"Retrieved {key}={value}")
+            self.logger.info("Retrieved %s=%s", key, value)
             return value
         else:
             # We're not responsible
-            self.logger.warning(f"Not responsible for key {key} (id={key_id})")
+            self.logger.warning("Not responsible for key %s (id=%s)", key, key_id)
             return None
     
+    def _am_sole_node(self) -> bool:
+        """Check whether this node is the only one in the ring."""
+        successor = self.finger_table.get_successor()
+        return successor is None or successor.node_id == self.node_id
+    
     # ==================== Replication ====================
     
     def get_successor_list(self, n: int = None) -> List[NodeInfo]:
@@ -317,7 +409,9 @@ class ChordNode:
             # For now, just ensure successor is in the list
             successor = self.finger_table.get_successor()
             if not self.successor_list or self.successor_list[0] != successor:
-                self.successor_list = [successor] + self.successor_list[:self.n_replicas-1]
+                # Shift the new successor in place and drop whatever falls off the end
+                self.successor_list.insert(0, successor)
+                del self.successor_list[self.n_replicas:]
     
     async def update_successor_list_network(self, network_manager):
         """
@@ -327,8 +421,6 @@ class ChordNode:
         Args:
             network_manager: NetworkManager instance for sending messages
         """
-        from communication.message import Message, MessageType
-        
         successor = self.finger_table.get_successor()
         if not successor:
             self.logger.warning("No successor set in finger table")
@@ -339,12 +431,17 @@ class ChordNode:
             # We're the only node, check if we have a predecessor we can use
             if self.predecessor and self.predecessor.node_id != self.node_id:
                 self.successor_list = [self.predecessor]
-                self.logger.info(f"Single node ring, using predecessor as successor: {self.predecessor}")
+                self.logger.info("Single node ring, using predecessor as successor: %s", self.predecessor)
             else:
                 self.successor_list = []
                 self.logger.info("Single node ring, no replicas available")
             return
         
+        # Just seeded from the ring snapshot taken on join; skip the round trip
+        if (time.monotonic() < self._successor_list_fresh_until
+                and self.successor_list and self.successor_list[0] == successor):
+            return
+        
         try:
             # Start with our immediate successor
             new_list = [successor]
@@ -366,20 +463,16 @@ class ChordNode:
             if response and response.msg_type == MessageType.GET_SUCCESSOR_LIST_REPLY:
                 successor_succ_list = response.data.get('successor_list', [])
                 
-                # Add nodes from successor's list (excluding self and duplicates)
+                # Add nodes from successor's list (excluding self and duplicates);
+                # entries arrive as JSON-decoded {'node_id', 'address'} dicts
                 for node_data in successor_succ_list:
                     if len(new_list) >= self.n_replicas:
                         break
-                        
-                    if isinstance(node_data, dict):
-                        node_id = node_data['node_id']
-                        if node_id not in seen_ids:
-                            new_list.append(NodeInfo(node_id, node_data['address']))
-                            seen_ids.add(node_id)
-                    elif isinstance(node_data, NodeInfo):
-                        if node_data.node_id not in seen_ids:
-                            new_list.append(node_data)
-                            seen_ids.add(node_data.node_id)
+                    node_id = node_data['node_id']
+                    if node_id in seen_ids:
+                        continue
+                    new_list.append(NodeInfo(node_id, node_data['address']))
+                    seen_ids.add(node_id)
             
             # Also add predecessor if we still need more and it's not already in the list
             if len(new_list) < self.n_replicas and self.predecessor:
@@ -388,10 +481,12 @@ class ChordNode:
                     seen_ids.add(self.predecessor.node_id)
             
             self.successor_list = new_list[:self.n_replicas]
-            self.logger.info(f"Updated successor list ({len(self.successor_list)} nodes): {[str(n) for n in self.successor_list]}")
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("Updated successor list (%s nodes): %s", len(self.successor_list),
+                                 [str(n) for n in self.successor_list])
                 
         except Exception as e:
-            self.logger.error(f"Error updating successor list: {e}")
+            self.logger.error("Error updating successor list: %s", e)
             # Fallback: at least keep our immediate successor
             if successor and successor.node_id != self.node_id:
                 self.successor_list = [successor]
@@ -404,8 +499,6 @@ class ChordNode:
         Args:
             network_manager: NetworkManager instance for sending messages
         """
-        from communication.message import Message, MessageType
-        
         successor = self.finger_table.get_successor()
         
         # If we're pointing to ourselves and we have a predecessor, 
@@ -415,7 +508,7 @@ class ChordNode:
             # That predecessor should be our successor too (in a 2-node ring)
             self.finger_table.set_successor(self.predecessor)
             successor = self.predecessor
-            self.logger.info(f"Stabilize: was alone, now successor = {successor}")
+            self.logger.info("Stabilize: was alone, now successor = %s", successor)
         
         if not successor or successor.node_id == self.node_id:
             return
@@ -444,7 +537,7 @@ class ChordNode:
                     if x.node_id != self.node_id and in_range(x.node_id, self.node_id, successor.node_id,
                                inclusive_start=False, inclusive_end=False):
                         self.finger_table.set_successor(x)
-                        self.logger.info(f"Stabilize: updated successor to {x}")
+                        self.logger.info("Stabilize: updated successor to %s", x)
             
             # Notify our (possibly new) successor that we exist
             new_successor = self.finger_table.get_successor()
@@ -453,15 +546,23 @@ class ChordNode:
                 sender_id=self.node_id,
                 sender_address=self.address,
                 msg_id=network_manager.generate_msg_id(),
-                data={'node_id': self.node_id, 'address': self.address}
+                data=self._self_info_dict
             )
             
-            await network_manager.send_message(
-                new_successor.address, notify_msg, wait_response=False
-            )
+            # One-way message: send it in the background instead of waiting on the write
+            self._send_in_background(network_manager, new_successor.address, notify_msg)
             
         except Exception as e:
-            self.logger.error(f"Stabilization error: {e}")
+            self.logger.error("Stabilization error: %s", e)
+    
+    def _send_in_background(self, network_manager, address: str, msg: Message,
+                            timeout: float = 5.0):
+        """Send a message that needs no response without awaiting it."""
+        task = asyncio.create_task(
+            network_manager.send_message(address, msg, wait_response=False, timeout=timeout)
+        )
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
     
     async def join_ring_network(self, known_node: NodeInfo, network_manager):
         """
@@ -472,8 +573,6 @@ class ChordNode:
             known_node: An existing node in the ring
             network_manager: NetworkManager instance for sending messages
         """
-        from communication.message import Message, MessageType
-        
         self.predecessor = None
         
         try:
@@ -496,20 +595,20 @@ class ChordNode:
                     successor = NodeInfo(succ_data['node_id'], succ_data['address'])
                     self.finger_table.set_successor(successor)
                     self.successor_list = [successor]
-                    self.logger.info(f"Joined ring: successor = {successor}")
+                    self.logger.info("Joined ring: successor = %s", successor)
                 else:
                     # Fallback to known node
                     self.finger_table.set_successor(known_node)
                     self.successor_list = [known_node]
-                    self.logger.info(f"Joined ring via known node: {known_node}")
+                    self.logger.info("Joined ring via known node: %s", known_node)
             else:
                 # Fallback to known node as successor
                 self.finger_table.set_successor(known_node)
                 self.successor_list = [known_node]
-                self.logger.info(f"Joined ring (fallback): successor = {known_node}")
+                self.logger.info("Joined ring (fallback): successor = %s", known_node)
                 
         except Exception as e:
-            self.logger.error(f"Error joining ring: {e}")
+            self.logger.error("Error joining ring: %s", e)
             # Fallback to known node
             self.finger_table.set_successor(known_node)
             self.successor_list = [known_node]
@@ -529,12 +628,11 @@ class ChordNode:
             known_node: An existing node in the ring
             network_manager: NetworkManager instance for sending messages
         """
-        from communication.message import Message, MessageType
-        
         self.predecessor = None
         
         try:
-            # Step 1: Find our successor
+            # Steps 1 and 2: find our successor and get ALL nodes in ring. Both are
+            # independent queries to known_node, so they are sent concurrently
             self.logger.info("Step 1: Finding successor...")
             msg = Message(
                 msg_type=MessageType.FIND_SUCCESSOR,
@@ -543,9 +641,12 @@ class ChordNode:
                 msg_id=network_manager.generate_msg_id(),
                 data={'identifier': self.node_id}
             )
-            
-            response = await network_manager.send_message(
-                known_node.address, msg, wait_response=True, timeout=10.0
+            self.logger.info("Step 2: Getting all nodes in ring...")
+            response, all_nodes = await asyncio.gather(
+                network_manager.send_message(
+                    known_node.address, msg, wait_response=True, timeout=10.0
+                ),
+                self._get_all_nodes_from(known_node, network_manager)
             )
             
             successor = None
@@ -559,16 +660,19 @@ class ChordNode:
             
             self.finger_table.set_successor(successor)
             self.successor_list = [successor]
-            self.logger.info(f"Found successor: {successor}")
-            
-            # Step 2: Get ALL nodes in ring
-            self.logger.info("Step 2: Getting all nodes in ring...")
-            all_nodes = await self._get_all_nodes_from(known_node, network_manager)
+            self.logger.info("Found successor: %s", successor)
             
             # Add ourselves to the node list
             all_nodes.append(self.get_info())
             self.finger_table.set_all_nodes(all_nodes)
-            self.logger.info(f"Full ring knowledge: {len(all_nodes)} nodes")
+            self.logger.info("Full ring knowledge: %s nodes", len(all_nodes))
+            
+            # The nodes after us in the full ring are our successor list; use them
+            # now instead of querying the successor on the next update
+            ring_successors = self.finger_table.get_n_successors(self.node_id, self.n_replicas + 1)
+            self.successor_list = [n for n in ring_successors if n.node_id != self.node_id][:self.n_replicas]
+            if self.successor_list:
+                self._successor_list_fresh_until = time.monotonic() + self.SUCCESSOR_LIST_SEED_TTL
             
             # Step 3: Broadcast join to all nodes
             self.logger.info("Step 3: Broadcasting join to all nodes...")
@@ -583,12 +687,12 @@ class ChordNode:
                 self.logger.info("Step 5: Loading persistent storage...")
                 primary_count = self.storage.load_all_primary()
                 backup_count = self.storage.load_all_backups()
-                self.logger.info(f"Loaded {primary_count} primary keys, {backup_count} backup keys")
+                self.logger.info("Loaded %s primary keys, %s backup keys", primary_count, backup_count)
             
             self.logger.info("Join complete!")
             
         except Exception as e:
-            self.logger.error(f"Error in enhanced join: {e}")
+            self.logger.error("Error in enhanced join: %s", e)
             import traceback
             self.logger.error(traceback.format_exc())
             # Fallback to basic join
@@ -596,8 +700,6 @@ class ChordNode:
     
     async def _get_all_nodes_from(self, known_node: NodeInfo, network_manager) -> List[NodeInfo]:
         """Get list of all nodes in the ring from a known node."""
-        from communication.message import Message, MessageType
-        
         msg = Message(
             msg_type=MessageType.GET_ALL_NODES,
             sender_id=self.node_id,
@@ -623,81 +725,91 @@ class ChordNode:
     
     async def _broadcast_join(self, all_nodes: List[NodeInfo], network_manager):
         """Broadcast join notification to all nodes in the ring."""
-        from communication.message import Message, MessageType
+        others = [node for node in all_nodes if node.node_id != self.node_id]
+        
+        # Notify every node concurrently
+        tasks = [self._send_broadcast_join(node, network_manager) for node in others]
+        results = await self._gather_by_deadline(tasks, 5.0)
         
-        my_info = self.get_info()
         success_count = 0
+        for node, result in zip(others, results):
+            if isinstance(result, Exception):
+                self.logger.warning("Failed to notify %s: %s", node, result)
+            elif result:
+                success_count += 1
         
-        for node in all_nodes:
-            if node.node_id == self.node_id:
-                continue
-            
-            try:
-                msg = Message(
-                    msg_type=MessageType.BROADCAST_JOIN,
-                    sender_id=self.node_id,
-                    sender_address=self.address,
-                    msg_id=network_manager.generate_msg_id(),
-                    data={
-                        'node_id': my_info.node_id,
-                        'address': my_info.address
-                    }
-                )
-                
-                response = await network_manager.send_message(
-                    node.address, msg, wait_response=True, timeout=5.0
-                )
-                
-                if response and response.msg_type == MessageType.BROADCAST_JOIN_ACK:
-                    success_count += 1
-                    
-            except Exception as e:
-                self.logger.warning(f"Failed to notify {node}: {e}")
+        self.logger.info("Broadcast join: %s/%s nodes notified", success_count, len(all_nodes)-1)
+    
+    async def _send_broadcast_join(self, node: NodeInfo, network_manager) -> bool:
+        """Send BROADCAST_JOIN to one node; returns True if it acknowledged."""
+        msg = Message(
+            msg_type=MessageType.BROADCAST_JOIN,
+            sender_id=self.node_id,
+            sender_address=self.address,
+            msg_id=network_manager.generate_msg_id(),
+            data=self._self_info_dict
+        )
+        
+        response = await network_manager.send_message(
+            node.address, msg, wait_response=True, timeout=5.0
+        )
         
-        self.logger.info(f"Broadcast join: {success_count}/{len(all_nodes)-1} nodes notified")
+        return bool(response and response.msg_type == MessageType.BROADCAST_JOIN_ACK)
     
     async def _transfer_keys_on_join(self, network_manager):
         """Request keys from our successors that should now belong to us."""
-        from communication.message import Message, MessageType
-        
         # Get our N-1 successors (they might have keys that belong to us)
-        successors = self.finger_table.get_n_successors(self.node_id, self.n_replicas)
+        successors = self.finger_table.get_n_successors(self.node_id, self.n_replicas)[1:]  # Skip ourselves
+        
+        # Request from all successors concurrently, then merge in ring order
+        tasks = [self._request_transfer_keys(successor, network_manager) for successor in successors]
+        results = await self._gather_by_deadline(tasks, 10.0)
         
-        for successor in successors[1:]:  # Skip ourselves
+        for successor, keys_data in zip(successors, results):
+            if isinstance(keys_data, Exception):
+                self.logger.warning("Failed to transfer keys from %s: %s", successor, keys_data)
+                continue
+            if keys_data is None:
+                continue
+            
             try:
-                msg = Message(
-                    msg_type=MessageType.TRANSFER_KEYS_REQUEST,
-                    sender_id=self.node_id,
-                    sender_address=self.address,
-                    msg_id=network_manager.generate_msg_id(),
-                    data={
-                        'new_node_id': self.node_id,
-                        'predecessor_id': self.predecessor.node_id if self.predecessor else None
-                    }
-                )
+                # Receive the keys
+                for key_str, value_data in keys_data.items():
+                    value = value_data['value']
+                    version_dict = value_data['version']
+                    version = VectorClock.from_dict(version_dict)
+                    
+                    # Store locally
+                    current = self.storage.get(key_str)
+                    if not current or current[1] < version:
+                        self.storage.put(key_str, value, version)
+                self.storage.flush()
                 
-                response = await network_manager.send_message(
-                    successor.address, msg, wait_response=True, timeout=10.0
-                )
+                self.logger.info("Received %s keys from %s", len(keys_data), successor)
                 
-                if response and response.msg_type == MessageType.TRANSFER_KEYS_RESPONSE:
-                    keys_data = response.data.get('keys', {})
-                    
-                    # Receive the keys
-                    for key_str, value_data in keys_data.items():
-                        value = value_data['value']
-                        version_dict = value_data['version']
-                        version = VectorClock.from_dict(version_dict)
-                        
-                        # Store locally
-                        current = self.storage.get(key_str)
-                        if not current or current[1] < version:
-                            self.storage.put(key_str, value, version)
-                    
-                    self.logger.info(f"Received {len(keys_data)} keys from {successor}")
-                    
             except Exception as e:
-                self.logger.warning(f"Failed to transfer keys from {successor}: {e}")
+                self.logger.warning("Failed to transfer keys from %s: %s", successor, e)
+    
+    async def _request_transfer_keys(self, successor: NodeInfo, network_manager) -> Optional[dict]:
+        """Ask one successor for the keys that now belong to us (None if it did not answer)."""
+        msg = Message(
+            msg_type=MessageType.TRANSFER_KEYS_REQUEST,
+            sender_id=self.node_id,
+            sender_address=self.address,
+            msg_id=network_manager.generate_msg_id(),
+            data={
+                'new_node_id': self.node_id,
+                'predecessor_id': self.predecessor.node_id if self.predecessor else None
+            }
+        )
+        
+        response = await network_manager.send_message(
+            successor.address, msg, wait_response=True, timeout=10.0
+        )
+        
+        if response and response.msg_type == MessageType.TRANSFER_KEYS_RESPONSE:
+            return response.data.get('keys', {})
+        return None
     
     # ==================== Hinted Handoff Recovery ====================
     
@@ -715,10 +827,8 @@ class ChordNode:
         Args:
             network_manager: NetworkManager instance for communication
         """
-        from communication.message import Message, MessageType
-        from consistency.vector_clock import VectorClock
         
-        self.logger.info(f"Starting hinted handoff recovery for node {self.node_id}")
+        self.logger.info("Starting hinted handoff recovery for node %s", self.node_id)
         
         # Step 1: Get next N-1 successors (nodes that might have hints for us)
         next_nodes = self.finger_table.get_n_successors(self.node_id, self.n_replicas)
@@ -729,102 +839,127 @@ class ChordNode:
             self.logger.info("No successors found for recovery, using successor list")
             next_nodes = self.successor_list[:self.n_replicas - 1]
         
-        self.logger.info(f"Checking next {len(next_nodes)} nodes for hinted handoffs: {[str(n) for n in next_nodes]}")
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("Checking next %s nodes for hinted handoffs: %s", len(next_nodes),
+                             [str(n) for n in next_nodes])
         
         recovered_keys = {}  # key -> (value, version)
+        recovered_raw_versions = {}  # key -> version dict as received, for cheap equality checks
+        
+        # Step 2: Request hinted handoff data from all successors concurrently
+        tasks = [self._request_handoff_keys(node, network_manager) for node in next_nodes]
+        results = await self._gather_by_deadline(tasks, 5.0)
         
-        # Step 2: Request hinted handoff data from each successor
-        for node in next_nodes:
+        for node, keys_data in zip(next_nodes, results):
+            if isinstance(keys_data, Exception):
+                self.logger.error("Error recovering from %s: %s", node, keys_data)
+                continue
+            if keys_data is None:
+                continue
+            
             try:
-                msg = Message(
-                    msg_type=MessageType.RECOVER_HANDOFF,
-                    sender_id=self.node_id,
-                    sender_address=self.address,
-                    msg_id=network_manager.generate_msg_id(),
-                    data={'requesting_node_id': self.node_id}
-                )
+                self.logger.info("Received %s keys from %s", len(keys_data), node)
                 
-                response = await network_manager.send_message(
-                    node.address, msg, wait_response=True, timeout=5.0
-                )
+                # Keys no earlier node returned are taken as-is in one pass
+                new_keys = {key: data for key, data in keys_data.items() if key not in recovered_keys}
                 
-                if response and response.msg_type == MessageType.RECOVER_HANDOFF_REPLY:
-                    keys_data = response.data.get('keys', {})
-                    self.logger.info(f"Received {len(keys_data)} keys from {node}")
-                    
-                    # Merge keys with version reconciliation
-                    for key, data in keys_data.items():
-                        value = data['value']
-                        version = VectorClock.from_dict(data['version'])
-                        
-                        if key not in recovered_keys:
-                            recovered_keys[key] = (value, version)
-                        else:
-                            # Keep the newer version
-                            _, existing_version = recovered_keys[key]
-                            if version > existing_version:
-                                recovered_keys[key] = (value, version)
-                                self.logger.info(f"Updated key '{key}' with newer version from {node}")
+                # Merge the overlap with version reconciliation. Replicas usually
+                # hold the same version, which the raw dicts show without parsing.
+                for key, data in keys_data.items():
+                    if key in new_keys or data['version'] == recovered_raw_versions[key]:
+                        continue
+                    # Keep the newer version
+                    version = VectorClock.from_dict(data['version'])
+                    if version > recovered_keys[key][1]:
+                        recovered_keys[key] = (data['value'], version)
+                        recovered_raw_versions[key] = data['version']
+                        self.logger.info("Updated key '%s' with newer version from %s", key, node)
+                
+                recovered_keys.update({key: (data['value'], VectorClock.from_dict(data['version']))
+                                       for key, data in new_keys.items()})
+                recovered_raw_versions.update({key: data['version'] for key, data in new_keys.items()})
                 
             except Exception as e:
-                self.logger.error(f"Error recovering from {node}: {e}")
+                self.logger.error("Error recovering from %s: %s", node, e)
         
         # Step 3: Update our primary storage with recovered keys
-        self.logger.info(f"Recovered {len(recovered_keys)} unique keys, updating primary storage")
+        self.logger.info("Recovered %s unique keys, updating primary storage", len(recovered_keys))
+        
+        # Keys we do not hold at all need no version comparison; store them in one go
+        new_items = {key: item for key, item in recovered_keys.items() if not self.storage.has_key(key)}
+        if new_items:
+            self.storage.put_many(new_items)
+            self.logger.info("Restored %s new primary keys", len(new_items))
+        
+        # Hot loop on large recoveries: bind the lookups once and decide up front
+        # whether the per-key INFO lines are wanted at all
+        storage_get = self.storage.get
+        storage_put = self.storage.put
+        log_info = self.logger.info
+        verbose = self.logger.isEnabledFor(logging.INFO)
         for key, (value, version) in recovered_keys.items():
-            # Check if we already have this key in primary storage
-            existing = self.storage.get(key)
-            if existing:
-                _, existing_version = existing
-                self.logger.info(f"Comparing versions for key '{key}': local={existing_version}, recovered={version}")
-                
-                # If recovered version is newer OR concurrent (which means we were down and missed updates)
-                if version > existing_version:
-                    # Recovered version is strictly newer
-                    self.storage.put(key, value, version)
-                    self.logger.info(f"Restored primary key (newer): {key}={value} (version: {version})")
-                elif version.concurrent_with(existing_version):
-                    # Versions are concurrent - we were down, so accept the recovered version
-                    # Merge the clocks to preserve causality
-                    merged_version = existing_version.copy()
-                    merged_version.update(version)
-                    self.storage.put(key, value, merged_version)
-                    self.logger.info(f"Restored primary key (concurrent, merged): {key}={value} (version: {merged_version})")
-                else:
-                    # Our local version is newer - keep it
-                    self.logger.info(f"Keeping local version (newer): {key} (version: {existing_version})")
-            else:
-                # No existing key, just store it
-                self.storage.put(key, value, version)
-                self.logger.info(f"Restored primary key (new): {key}={value} (version: {version})")
+            if key in new_items:
+                continue
+            # We already hold this key; compare with the local version
+            existing_value, existing_version = storage_get(key)
+            if existing_value == value and existing_version.clock == version.clock:
+                # Replay of what we already have; nothing to reconcile or rewrite
+                continue
+            if verbose:
+                log_info("Comparing versions for key '%s': local=%s, recovered=%s", key, existing_version, version)
+            
+            # Order the two versions and merge them in a single walk over the clocks
+            relationship, merged_version = compare_and_merge(version, existing_version)
+            
+            # If recovered version is newer OR concurrent (which means we were down and missed updates)
+            if relationship == "v1>v2":
+                # Recovered version is strictly newer
+                storage_put(key, value, version)
+                if verbose:
+                    log_info("Restored primary key (newer): %s=%s (version: %s)", key, value, version)
+            elif relationship in ("concurrent", "v1=v2"):
+                # Versions are concurrent (equal clocks are neither before nor after
+                # each other) - we were down, so accept the recovered version
+                # Merge the clocks to preserve causality
+                storage_put(key, value, merged_version)
+                if verbose:
+                    log_info("Restored primary key (concurrent, merged): %s=%s (version: %s)", key, value, merged_version)
+            elif verbose:
+                # Our local version is newer - keep it
+                log_info("Keeping local version (newer): %s (version: %s)", key, existing_version)
+        # The holders dropped their hints when they replied; get our copies out now
+        self.storage.flush()
         
         # Step 4: Replicate to our new N-1 successors as backups
         if recovered_keys:
             await self.update_successor_list_network(network_manager)
             replicas = self.successor_list[:self.n_replicas - 1]
             
-            self.logger.info(f"Replicating {len(recovered_keys)} recovered keys to {len(replicas)} successors")
+            self.logger.info("Replicating %s recovered keys to %s successors", len(recovered_keys), len(replicas))
+            # All recovered keys travel in a single message per replica; the
+            # payload is the same for every replica, so build it once
+            data = {
+                'keys': {
+                    key: {'value': value, 'version': version.to_dict()}
+                    for key, (value, version) in recovered_keys.items()
+                },
+                'primary_node_id': self.node_id
+            }
+            # One-way messages: start them all in the background rather than
+            # waiting for each replica in turn
             for replica in replicas:
-                for key, (value, version) in recovered_keys.items():
-                    try:
-                        msg = Message(
-                            msg_type=MessageType.UPDATE_BACKUP,
-                            sender_id=self.node_id,
-                            sender_address=self.address,
-                            msg_id=network_manager.generate_msg_id(),
-                            data={
-                                'key': key,
-                                'value': value,
-                                'version': version.to_dict(),
-                                'primary_node_id': self.node_id
-                            }
-                        )
-                        
-                        await network_manager.send_message(
-                            replica.address, msg, wait_response=False, timeout=3.0
-                        )
-                    except Exception as e:
-                        self.logger.error(f"Error replicating to {replica}: {e}")
+                try:
+                    msg = Message(
+                        msg_type=MessageType.UPDATE_BACKUP_BATCH,
+                        sender_id=self.node_id,
+                        sender_address=self.address,
+                        msg_id=network_manager.generate_msg_id(),
+                        data=data
+                    )
+                    
+                    self._send_in_background(network_manager, replica.address, msg, timeout=3.0)
+                except Exception as e:
+                    self.logger.error("Error replicating to %s: %s", replica, e)
         
         # Step 5: Update backups on previous N-1 predecessors
         # Get nodes before us in the ring
@@ -834,10 +969,65 @@ class ChordNode:
             # Try to get more predecessors by walking backwards
             # In a full implementation, we'd query predecessor.predecessor, etc.
         
-        self.logger.info(f"Hinted handoff recovery complete. Recovered {len(recovered_keys)} keys.")
+        self.logger.info("Hinted handoff recovery complete. Recovered %s keys.", len(recovered_keys))
+    
+    async def _request_handoff_keys(self, node: NodeInfo, network_manager) -> Optional[dict]:
+        """Ask one node for the hinted handoff keys it holds for us (None if it did not answer)."""
+        msg = Message(
+            msg_type=MessageType.RECOVER_HANDOFF,
+            sender_id=self.node_id,
+            sender_address=self.address,
+            msg_id=network_manager.generate_msg_id(),
+            data={'requesting_node_id': self.node_id}
+        )
+        
+        response = await network_manager.send_message(
+            node.address, msg, wait_response=True, timeout=5.0
+        )
+        
+        if response and response.msg_type == MessageType.RECOVER_HANDOFF_REPLY:
+            return response.data.get('keys', {})
+        return None
     
     # ==================== Utility Methods ====================
     
+    @staticmethod
+    async def _gather_by_deadline(coros, timeout: float) -> list:
+        """
+        Run RPC coroutines concurrently under one shared deadline.
+        
+        Like asyncio.gather(..., return_exceptions=True), results come back in
+        order with exceptions in place. Calls still running when the deadline
+        passes are cancelled and reported as asyncio.TimeoutError, so dead
+        peers hold the batch up for one timeout in total.
+        
+        Args:
+            coros: Coroutines to run
+            timeout: Seconds allowed for the whole batch
+            
+        Returns:
+            List of results or exceptions, one per coroutine
+        """
+        tasks = [asyncio.ensure_future(coro) for coro in coros]
+        if not tasks:
+            return []
+        
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        # Let cancelled calls close their connections before returning
+        await asyncio.gather(*pending, return_exceptions=True)
+        
+        results = []
+        for task in tasks:
+            if task in pending:
+                results.append(asyncio.TimeoutError(f"no reply within {timeout}s"))
+            elif task.exception() is not None:
+                results.append(task.exception())
+            else:
+                results.append(task.result())
+        return results
+    
     def get_status(self) -> dict:
         """
         Get current node status.
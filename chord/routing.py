@@ -3,6 +3,8 @@ Finger table and routing logic for Chord DHT.
 """
 
 import hashlib
+from bisect import bisect_left, bisect_right, insort
+from functools import lru_cache
 from typing import Optional, Tuple, List
 from dataclasses import dataclass
 
@@ -10,6 +12,8 @@ from dataclasses import dataclass
 @dataclass
 class NodeInfo:
     """Information about a Chord node."""
+    __slots__ = ('node_id', 'address')
+    
     node_id: int
     address: str  # "host:port"
     
@@ -47,17 +51,31 @@ class FingerTable:
         self.node_id = node_id
         self.m = m
         self.max_id = 2 ** m
+        # Ring arithmetic mod 2^m as a bit mask
+        self.mask = self.max_id - 1
         
         # Finger table: list of m entries (for backwards compatibility)
         # Each entry is (start, interval, node)
         # where start = (n + 2^(i-1)) mod 2^m
         self.fingers: List[Optional[NodeInfo]] = [None] * m
         
+        # Node ids of the finger entries (-1 when unset), kept in step with
+        # self.fingers so routing can scan plain integers
+        self._finger_ids: List[int] = [-1] * m
+        # Indices of the fingers that are set, ascending; lets routing skip empty slots
+        self._present_fingers: List[int] = []
+        
         # Cache the start values for each finger
-        self.starts = [(node_id + 2**i) % self.max_id for i in range(m)]
+        self.starts = tuple((node_id + (1 << i)) & self.mask for i in range(m))
         
         # NEW: Full ring knowledge - ALL nodes sorted by ID
         self.all_nodes: List[NodeInfo] = []
+        # Sorted node ids parallel to all_nodes, for bisect lookups
+        self._node_ids: List[int] = []
+        
+        # Bumped on every change to fingers or all_nodes, so callers can
+        # tell when routing results they cached have gone stale
+        self.version = 0
     
     def get_finger(self, index: int) -> Optional[NodeInfo]:
         """
@@ -81,8 +99,22 @@ class FingerTable:
             index: Finger table index (0 to m-1)
             node: NodeInfo to set
         """
-        if 0 <= index < self.m:
-            self.fingers[index] = node
+        if 0 <= index < self.m and self.fingers[index] is not node:
+            self._store_finger(index, node)
+    
+    def _store_finger(self, index: int, node: Optional[NodeInfo]):
+        """Write a finger slot and keep _finger_ids and _present_fingers in step."""
+        was_set = self.fingers[index] is not None
+        self.fingers[index] = node
+        if node is not None:
+            self._finger_ids[index] = node.node_id
+            if not was_set:
+                insort(self._present_fingers, index)
+        else:
+            self._finger_ids[index] = -1
+            if was_set:
+                self._present_fingers.remove(index)
+        self.version += 1
     
     def get_start(self, index: int) -> int:
         """
@@ -108,12 +140,18 @@ class FingerTable:
         Returns:
             NodeInfo of closest preceding node, or None
         """
-        # Search from highest finger to lowest
-        for i in range(self.m - 1, -1, -1):
-            finger = self.fingers[i]
-            if finger and in_range(finger.node_id, self.node_id, identifier, 
-                                   inclusive_start=False):
-                return finger
+        finger_ids = self._finger_ids
+        node_id = self.node_id
+        mask = self.mask
+        # Finger must lie in (node_id, identifier]: x is in (a, b] exactly when
+        # ((x - a - 1) & mask) <= ((b - a - 1) & mask), and a == b spans the
+        # whole ring as in in_range
+        limit = (identifier - node_id - 1) & mask
+        
+        # Search from highest finger to lowest, visiting only the ones that are set
+        for i in reversed(self._present_fingers):
+            if (finger_ids[i] - node_id - 1) & mask <= limit:
+                return self.fingers[i]
         return None
     
     def get_successor(self) -> Optional[NodeInfo]:
@@ -132,7 +170,8 @@ class FingerTable:
         Args:
             node: NodeInfo of the successor
         """
-        self.fingers[0] = node
+        if self.fingers[0] is not node:
+            self._store_finger(0, node)
     
     def get_all_fingers(self) -> List[Optional[NodeInfo]]:
         """
@@ -146,7 +185,11 @@ class FingerTable:
     def clear(self):
         """Clear all finger table entries."""
         self.fingers = [None] * self.m
+        self._finger_ids = [-1] * self.m
+        self._present_fingers = []
         self.all_nodes = []
+        self._node_ids = []
+        self.version += 1
     
     # ==================== NEW: Full Ring Knowledge Methods ====================
     
@@ -159,18 +202,13 @@ class FingerTable:
         """
         # Store unique nodes sorted by ID
         unique_nodes = {node.node_id: node for node in nodes if node}
-        self.all_nodes = sorted(unique_nodes.values(), key=lambda n: n.node_id)
+        self._node_ids = sorted(unique_nodes)
+        self.all_nodes = [unique_nodes[node_id] for node_id in self._node_ids]
+        self.version += 1
         
         # Also update first finger entry (successor) if we have nodes
         if self.all_nodes:
-            # Find our successor (first node with ID >= ours, or wrap to first)
-            for node in self.all_nodes:
-                if node.node_id > self.node_id:
-                    self.set_successor(node)
-                    break
-            else:
-                # Wrap around to first node
-                self.set_successor(self.all_nodes[0])
+            self.set_successor(self._next_node_after(self.node_id))
     
     def add_node(self, node: NodeInfo):
         """
@@ -180,16 +218,18 @@ class FingerTable:
             node: NodeInfo to add
         """
         # Check if node already exists
-        for existing in self.all_nodes:
-            if existing.node_id == node.node_id:
-                # Update address if different
-                if existing.address != node.address:
-                    existing.address = node.address
-                return
-        
-        # Add and re-sort
-        self.all_nodes.append(node)
-        self.all_nodes.sort(key=lambda n: n.node_id)
+        index = bisect_left(self._node_ids, node.node_id)
+        if index < len(self._node_ids) and self._node_ids[index] == node.node_id:
+            existing = self.all_nodes[index]
+            # Update address if different
+            if existing.address != node.address:
+                existing.address = node.address
+            return
+        
+        # Insert at its sorted position
+        self._node_ids.insert(index, node.node_id)
+        self.all_nodes.insert(index, node)
+        self.version += 1
         
         # Update successor if needed
         successor = self.get_successor()
@@ -207,26 +247,25 @@ class FingerTable:
         Returns:
             True if removed, False if not found
         """
-        self.all_nodes = [n for n in self.all_nodes if n.node_id != node_id]
+        index = bisect_left(self._node_ids, node_id)
+        if index < len(self._node_ids) and self._node_ids[index] == node_id:
+            del self._node_ids[index]
+            del self.all_nodes[index]
+        self.version += 1
         
         # Update successor if we removed it
         successor = self.get_successor()
         if successor and successor.node_id == node_id:
             if self.all_nodes:
                 # Find new successor
-                for node in self.all_nodes:
-                    if node.node_id > self.node_id:
-                        self.set_successor(node)
-                        break
-                else:
-                    self.set_successor(self.all_nodes[0])
+                self.set_successor(self._next_node_after(self.node_id))
             else:
                 self.set_successor(None)
         
         # Also remove from finger table
-        for i in range(self.m):
-            if self.fingers[i] and self.fingers[i].node_id == node_id:
-                self.fingers[i] = None
+        for i in self._present_fingers[:]:
+            if self._finger_ids[i] == node_id:
+                self._store_finger(i, None)
         
         return True
     
@@ -239,6 +278,21 @@ class FingerTable:
         """
         return self.all_nodes.copy()
     
+    def iter_all_nodes(self):
+        """
+        Iterate over all known nodes without copying the list.
+        
+        Callers must not change ring membership while iterating.
+        
+        Returns:
+            Iterator over NodeInfo objects sorted by ID
+        """
+        return iter(self.all_nodes)
+    
+    def node_count(self) -> int:
+        """Number of nodes in the full ring knowledge."""
+        return len(self.all_nodes)
+    
     def find_successor_from_all(self, identifier: int) -> Optional[NodeInfo]:
         """
         Find the responsible node for an identifier using full ring knowledge.
@@ -252,13 +306,9 @@ class FingerTable:
         if not self.all_nodes:
             return None
         
-        # Find first node with ID >= identifier
-        for node in self.all_nodes:
-            if node.node_id >= identifier:
-                return node
-        
-        # Wrap around to first node
-        return self.all_nodes[0]
+        # First node with ID >= identifier, wrapping around to the first node
+        index = bisect_left(self._node_ids, identifier)
+        return self.all_nodes[index % len(self.all_nodes)]
     
     def get_n_successors(self, identifier: int, n: int) -> List[NodeInfo]:
         """
@@ -275,26 +325,21 @@ class FingerTable:
         if not self.all_nodes or n <= 0:
             return []
         
-        # Find the responsible node (first successor)
-        responsible = self.find_successor_from_all(identifier)
-        if not responsible:
-            return []
-        
-        # Find index of responsible node
-        try:
-            start_idx = self.all_nodes.index(responsible)
-        except ValueError:
-            return [responsible]
-        
-        # Get n nodes starting from responsible, wrapping around
-        result = []
+        # Index of the responsible node (first successor)
         num_nodes = len(self.all_nodes)
-        for i in range(min(n, num_nodes)):
-            idx = (start_idx + i) % num_nodes
-            result.append(self.all_nodes[idx])
+        start_idx = bisect_left(self._node_ids, identifier) % num_nodes
         
+        # Get n nodes starting from responsible, wrapping around
+        result = self.all_nodes[start_idx:start_idx + n]
+        if len(result) < n:
+            result += self.all_nodes[:min(n, num_nodes) - len(result)]
         return result
     
+    def _next_node_after(self, node_id: int) -> NodeInfo:
+        """First known node with ID > node_id, wrapping to the first node (all_nodes must be non-empty)."""
+        index = bisect_right(self._node_ids, node_id)
+        return self.all_nodes[index % len(self.all_nodes)]
+    
     # ==================== End of Full Ring Knowledge Methods ====================
     
     def __repr__(self) -> str:
@@ -323,7 +368,12 @@ def hash_address(address: str, m: int = None) -> int:
     if m is None:
         from config import M
         m = M
-    
+    return _hash_address(address, m)
+
+
+@lru_cache(maxsize=4096)
+def _hash_address(address: str, m: int) -> int:
+    """hash_address() with m resolved; memoized since the same endpoints are hashed repeatedly."""
     hash_obj = hashlib.sha1(address.encode())
     hash_bytes = hash_obj.digest()
     hash_int = int.from_bytes(hash_bytes, byteorder='big')
@@ -349,27 +399,14 @@ def in_range(identifier: int, start: int, end: int,
         # Full circle
         return True
     
-    # Adjust for inclusivity
+    # Each end is one comparison, with equality admitted by its inclusivity flag
+    after_start = identifier > start or (inclusive_start and identifier == start)
+    before_end = identifier < end or (inclusive_end and identifier == end)
     if start < end:
         # Normal range
-        if inclusive_start and inclusive_end:
-            return start <= identifier <= end
-        elif inclusive_start and not inclusive_end:
-            return start <= identifier < end
-        elif not inclusive_start and inclusive_end:
-            return start < identifier <= end
-        else:  # not inclusive_start and not inclusive_end
-            return start < identifier < end
-    else:
-        # Wraparound range
-        if inclusive_start and inclusive_end:
-            return identifier >= start or identifier <= end
-        elif inclusive_start and not inclusive_end:
-            return identifier >= start or identifier < end
-        elif not inclusive_start and inclusive_end:
-            return identifier > start or identifier <= end
-        else:  # not inclusive_start and not inclusive_end
-            return identifier > start or identifier < end
+        return after_start and before_end
+    # Wraparound range
+    return after_start or before_end
 
 
 if __name__ == "__main__":
@@ -4,12 +4,56 @@ ENHANCED: Now supports persistent storage with primary/backup separation.
 """
 
 import hashlib
+import mmap
 import os
+import threading
+from functools import lru_cache
 import json
-import pickle
-from typing import Dict, Optional, Tuple, Any, List
+from typing import Dict, Optional, Tuple, Any
 from consistency.vector_clock import VectorClock
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _encode_record(record: dict) -> bytes:
+    """Encode a log record as one line of JSON, with orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(record) + b"\n"
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits
+    # orjson would read big integers in these back as floats; mark them so the
+    # loader parses them with the json module
+    return json.dumps({**record, 'codec': 'json'}).encode() + b"\n"
+
+
+def _decode_record(line: bytes) -> dict:
+    """Decode a line written by _encode_record()."""
+    if orjson is None:
+        return json.loads(line)
+    try:
+        record = orjson.loads(line)
+    except orjson.JSONDecodeError:
+        return json.loads(line)  # NaN/Infinity are not JSON, but json accepts them
+    return json.loads(line) if record.get('codec') == 'json' else record
+
+
+def _fsync_dir(path: str):
+    """fsync a directory so a rename inside it survives a crash (best effort)."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return  # e.g. Windows cannot open directories
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
 
 class ChordStorage:
     """
@@ -18,8 +62,22 @@ class ChordStorage:
     ENHANCED: Supports persistent storage with:
     - Primary storage: keys we are responsible for
     - Backup storage: replicas of keys from other nodes
+    
+    Persistent writes are appended to one log per store (newline-separated JSON
+    records, replayed on load). flush() hands buffered records to the OS and
+    sync() fsyncs them; sync() may run on a worker thread so the disk wait
+    overlaps with further writes. Callers flush() before acknowledging a
+    write, so an acknowledged write survives the process crashing. A log is rewritten from the in-memory store
+    after loading and whenever it holds many more records than live keys.
     """
     
+    # Buffered log records written before flush() runs on its own
+    WAL_FLUSH_EVERY = 64
+    # A log is compacted once it holds more than this many records per live key
+    # (and at least WAL_COMPACT_MIN records)
+    WAL_COMPACT_FACTOR = 4
+    WAL_COMPACT_MIN = 1024
+    
     def __init__(self, node_id: int, base_dir: str = "storage", enable_persistence: bool = False):
         """
         Initialize storage for a Chord node.
@@ -39,6 +97,10 @@ class ChordStorage:
         # Legacy store for backwards compatibility
         self.store: Dict[str, Tuple[Any, VectorClock]] = self.primary_store
         
+        # Ring ids of primary keys, filled in as range scans hash them
+        self._key_ids: Dict[str, int] = {}
+        self._key_ids_m: Optional[int] = None
+        
         # Persistent storage paths
         if self.enable_persistence:
             self.storage_dir = os.path.join(base_dir, f"node_{node_id}")
@@ -48,6 +110,19 @@ class ChordStorage:
             # Create directories
             os.makedirs(self.primary_dir, exist_ok=True)
             os.makedirs(self.backup_dir, exist_ok=True)
+            
+            # Logs are keyed by owner: None for the primary store, otherwise the
+            # primary node_id whose backups the log holds
+            self._wals: Dict[Optional[int], Any] = {}  # owner -> open log
+            self._log_records: Dict[Optional[int], int] = {}  # owner -> records in the log file
+            # (primary node_id or None for primary keys, key) -> per-key file from the
+            # older layout, found while loading; deletes remove these without a stat
+            self._legacy_files: Dict[Tuple[Optional[int], str], str] = {}
+            self._pending_records = 0  # appended but not yet flushed
+            self._unsynced = False  # flushed but not yet fsynced
+            # Held by sync() while it fsyncs, which may be on a worker thread;
+            # anything closing a log takes it first so no fd is closed mid-fsync
+            self._close_lock = threading.Lock()
     
     def put(self, key: str, value: Any, version: Optional[VectorClock] = None) -> VectorClock:
         """
@@ -80,6 +155,21 @@ class ChordStorage:
         
         return version
     
+    def put_many(self, items: Dict[str, Tuple[Any, VectorClock]]):
+        """
+        Store several versioned key-value pairs at once.
+        
+        Args:
+            items: Dictionary of key -> (value, version); versions are stored as given
+        """
+        self.primary_store.update(items)
+        
+        # Persist to disk if enabled
+        if self.enable_persistence:
+            for key, (value, version) in items.items():
+                self._save_primary(key, value, version)
+            self.flush()
+    
     def put_backup(self, key: str, value: Any, version: VectorClock, for_node_id: int) -> VectorClock:
         """
         Store a backup replica for another node.
@@ -121,40 +211,218 @@ class ChordStorage:
     
     # ==================== Persistent Storage Methods ====================
     
+    def _wal_path(self, owner: Optional[int]) -> str:
+        """Path of the log for owner (None for the primary store)."""
+        if owner is None:
+            return os.path.join(self.primary_dir, "wal.log")
+        return os.path.join(self.backup_dir, f"wal_backup_{owner}.log")
+    
+    def _live(self, owner: Optional[int]) -> Dict[str, Tuple[Any, VectorClock]]:
+        """The in-memory store a log mirrors."""
+        if owner is None:
+            return self.primary_store
+        return self.backup_store.get(owner, {})
+    
+    def _wal(self, owner: Optional[int]):
+        """Return the log for owner, opening it on first use."""
+        wal = self._wals.get(owner)
+        if wal is None:
+            wal = self._wals[owner] = self._open_wal(self._wal_path(owner))
+        return wal
+    
+    @staticmethod
+    def _open_wal(path: str):
+        """Open a write-ahead log for appending; records are buffered until flush()."""
+        wal = open(path, 'ab', buffering=1 << 20)
+        if wal.tell():
+            # Terminate a record torn by a crash so the next one starts on its own line
+            with open(path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    wal.write(b"\n")
+        return wal
+    
+    def _append(self, owner: Optional[int], record: dict):
+        """Append one JSON record to owner's log, flushing once enough have piled up."""
+        self._wal(owner).write(_encode_record(record))
+        self._pending_records += 1
+        if self._pending_records >= self.WAL_FLUSH_EVERY:
+            self.flush()
+        
+        records = self._log_records[owner] = self._log_records.get(owner, 0) + 1
+        if records > self.WAL_COMPACT_MIN and records > self.WAL_COMPACT_FACTOR * len(self._live(owner)):
+            self._compact(owner)
+    
+    def _compact(self, owner: Optional[int]):
+        """
+        Rewrite owner's log as one put record per live key.
+        
+        The new log is written beside the old one, fsynced, and renamed over
+        it, so a crash leaves either the old or the new log in place. Files
+        from the older per-key layout are removed afterwards, since the log
+        now holds their data.
+        """
+        path = self._wal_path(owner)
+        live = self._live(owner)
+        wal = self._wals.pop(owner, None)
+        if wal is not None:
+            with self._close_lock:
+                wal.close()
+        
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(b"".join(
+                _encode_record({'op': 'put', 'key': key, 'value': value, 'version': version.to_dict()})
+                for key, (value, version) in live.items()
+            ))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        _fsync_dir(os.path.dirname(path))
+        self._log_records[owner] = len(live)
+        
+        for legacy_owner, key in [k for k in self._legacy_files if k[0] == owner]:
+            self._remove_legacy_file(legacy_owner, key)
+        if owner is not None:
+            try:
+                os.rmdir(os.path.join(self.backup_dir, f"node_{owner}"))
+            except OSError:
+                pass  # not there, or not empty
+    
+    def flush(self):
+        """Write buffered log records to the OS (one write per log, no fsync)."""
+        if not self.enable_persistence or not self._pending_records:
+            return
+        for wal in self._wals.values():
+            wal.flush()
+        self._pending_records = 0
+        self._unsynced = True
+    
+    def sync(self):
+        """
+        fsync logs written since the last sync.
+        
+        Only touches file descriptors, so it can run in an executor thread
+        while the event loop keeps appending.
+        """
+        if not self.enable_persistence or not self._unsynced:
+            return
+        self._unsynced = False
+        with self._close_lock:
+            for wal in list(self._wals.values()):
+                if not wal.closed:
+                    os.fsync(wal.fileno())
+    
+    def commit(self):
+        """Flush buffered log records and fsync them to disk."""
+        self.flush()
+        self.sync()
+    
+    def close(self):
+        """Commit outstanding records and close the logs."""
+        if not self.enable_persistence:
+            return
+        self.commit()
+        with self._close_lock:
+            for wal in self._wals.values():
+                wal.close()
+            self._wals.clear()
+    
     def _save_primary(self, key: str, value: Any, version: VectorClock):
-        """Save a primary key to disk as human-readable text."""
+        """Append a primary key write to the primary log."""
         if not self.enable_persistence:
             return
         
-        # Use .txt extension for human-readable files
-        key_file = os.path.join(self.primary_dir, f"{key}.txt")
-        with open(key_file, 'w') as f:
-            data = {
-                'key': key,
-                'value': value,
-                'version': version.to_dict(),
-                'type': 'primary'
-            }
-            json.dump(data, f, indent=2)
+        self._append(None, {
+            'op': 'put',
+            'key': key,
+            'value': value,
+            'version': version.to_dict()
+        })
     
     def _save_backup(self, key: str, value: Any, version: VectorClock, for_node_id: int):
-        """Save a backup key to disk as human-readable text."""
+        """Append a backup key write to the log for its primary node."""
         if not self.enable_persistence:
             return
         
-        node_backup_dir = os.path.join(self.backup_dir, f"node_{for_node_id}")
-        os.makedirs(node_backup_dir, exist_ok=True)
+        self._append(for_node_id, {
+            'op': 'put',
+            'key': key,
+            'value': value,
+            'version': version.to_dict()
+        })
+    
+    @staticmethod
+    def _replay(path: str, target: Dict[str, Tuple[Any, VectorClock]]) -> int:
+        """
+        Apply a log's records to target in order; the last record per key wins.
         
-        key_file = os.path.join(node_backup_dir, f"{key}.txt")
-        with open(key_file, 'w') as f:
-            data = {
-                'key': key,
-                'value': value,
-                'version': version.to_dict(),
-                'type': 'backup',
-                'primary_node_id': for_node_id
-            }
-            json.dump(data, f, indent=2)
+        Returns:
+            Number of records in the log
+        """
+        if not os.path.getsize(path):
+            return 0  # mmap cannot map an empty file
+        records = 0
+        # Map the log once and slice records out of it instead of reading line objects
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos, end = 0, len(mm)
+            while pos < end:
+                nl = mm.find(b"\n", pos)
+                if nl == -1:
+                    nl = end
+                line = mm[pos:nl]
+                pos = nl + 1
+                if not line.strip():
+                    continue  # newline added after a torn record
+                records += 1
+                try:
+                    record = _decode_record(line)
+                    if record['op'] == 'del':
+                        target.pop(record['key'], None)
+                    else:
+                        target[record['key']] = (record['value'], VectorClock.from_dict(record['version']))
+                except Exception as e:
+                    # A crash can leave a torn final line; skip anything unreadable
+                    print(f"Error replaying {path}: {e}")
+        return records
+    
+    def _load_legacy_dir(self, directory: str, target: Dict[str, Tuple[Any, VectorClock]],
+                         owner: Optional[int] = None) -> int:
+        """
+        Load per-key .txt files written by older versions of this class.
+        
+        Returns:
+            Number of files found
+        """
+        found = 0
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.endswith('.txt') and entry.is_file():
+                    key = entry.name[:-4]  # Remove .txt extension
+                    self._legacy_files[(owner, key)] = entry.path
+                    found += 1
+                    try:
+                        with open(entry.path, 'rb') as f:
+                            data = json.loads(f.read())
+                            target[key] = (data['value'], VectorClock.from_dict(data['version']))
+                    except Exception as e:
+                        print(f"Error loading key {key} from {directory}: {e}")
+        return found
+    
+    def _remove_legacy_file(self, owner: Optional[int], key: str):
+        """Delete the old-layout file for key, if loading found one."""
+        path = self._legacy_files.pop((owner, key), None)
+        if path is not None:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+    
+    def _compact_after_load(self, owner: Optional[int], records: int, legacy_files: int):
+        """Rewrite owner's log if it holds superseded records or old-layout files remain."""
+        self._log_records[owner] = records
+        if legacy_files or records > len(self._live(owner)):
+            self._compact(owner)
     
     def load_all_primary(self) -> int:
         """
@@ -166,21 +434,16 @@ class ChordStorage:
         if not self.enable_persistence or not os.path.exists(self.primary_dir):
             return 0
         
-        count = 0
-        for filename in os.listdir(self.primary_dir):
-            if filename.endswith('.txt'):
-                key = filename[:-4]  # Remove .txt extension
-                key_file = os.path.join(self.primary_dir, filename)
-                try:
-                    with open(key_file, 'r') as f:
-                        data = json.load(f)
-                        version = VectorClock.from_dict(data['version'])
-                        self.primary_store[key] = (data['value'], version)
-                        count += 1
-                except Exception as e:
-                    print(f"Error loading primary key {key}: {e}")
+        # Make sure everything we have written so far is in the file we read back
+        self.commit()
+        loaded: Dict[str, Tuple[Any, VectorClock]] = {}
+        legacy_files = self._load_legacy_dir(self.primary_dir, loaded)
+        wal_path = self._wal_path(None)
+        records = self._replay(wal_path, loaded) if os.path.exists(wal_path) else 0
         
-        return count
+        self.primary_store.update(loaded)
+        self._compact_after_load(None, records, legacy_files)
+        return len(loaded)
     
     def load_all_backups(self) -> int:
         """
@@ -192,30 +455,29 @@ class ChordStorage:
         if not self.enable_persistence or not os.path.exists(self.backup_dir):
             return 0
         
-        count = 0
-        for node_dir in os.listdir(self.backup_dir):
-            if node_dir.startswith('node_'):
-                node_id = int(node_dir.split('_')[1])
-                node_backup_dir = os.path.join(self.backup_dir, node_dir)
-                
-                if node_id not in self.backup_store:
-                    self.backup_store[node_id] = {}
-                
-                for filename in os.listdir(node_backup_dir):
-                    if filename.endswith('.txt'):
-                        key = filename[:-4]
-                        key_file = os.path.join(node_backup_dir, filename)
-                        try:
-                            with open(key_file, 'r') as f:
-                                data = json.load(f)
-                                version = VectorClock.from_dict(data['version'])
-                                self.backup_store[node_id][key] = (data['value'], version)
-                                count += 1
-                        except Exception as e:
-                            print(f"Error loading backup key {key} for node {node_id}: {e}")
-        
-        return count
+        self.commit()
+        loaded: Dict[int, Dict[str, Tuple[Any, VectorClock]]] = {}
+        legacy_files: Dict[int, int] = {}
+        records: Dict[int, int] = {}
+        with os.scandir(self.backup_dir) as it:
+            entries = list(it)
+        for entry in entries:
+            if entry.name.startswith('node_') and entry.is_dir():
+                # Older layout: one directory per primary node, one file per key
+                node_id = int(entry.name.split('_')[1])
+                legacy_files[node_id] = self._load_legacy_dir(
+                    entry.path, loaded.setdefault(node_id, {}), owner=node_id)
+        # Logs are newer than any legacy files, so they are applied last
+        for entry in entries:
+            if entry.name.startswith('wal_backup_') and entry.name.endswith('.log'):
+                node_id = int(entry.name[len('wal_backup_'):-len('.log')])
+                records[node_id] = self._replay(entry.path, loaded.setdefault(node_id, {}))
         
+        count = 0
+        for node_id, keys in loaded.items():
+            self.backup_store.setdefault(node_id, {}).update(keys)
+            count += len(keys)
+            self._compact_after_load(node_id, records.get(node_id, 0), legacy_files.get(node_id, 0))
         return count
     
     def get_all_backups_for_node(self, for_node_id: int) -> Dict[str, Tuple[Any, VectorClock]]:
@@ -230,6 +492,32 @@ class ChordStorage:
         """
         return self.backup_store.get(for_node_id, {}).copy()
     
+    def pop_backups_for_node(self, for_node_id: int) -> Dict[str, Tuple[Any, VectorClock]]:
+        """
+        Remove and return all backup keys for a specific primary node.
+        
+        Equivalent to get_all_backups_for_node() followed by delete_backup()
+        for each key, without copying the dict.
+        
+        Args:
+            for_node_id: ID of the primary node
+            
+        Returns:
+            Dictionary of key -> (value, version)
+        """
+        backups = self.backup_store.get(for_node_id)
+        if not backups:
+            return {}
+        # Leave an empty dict behind, as deleting the keys one by one would
+        self.backup_store[for_node_id] = {}
+        
+        if self.enable_persistence:
+            for key in backups:
+                self._append(for_node_id, {'op': 'del', 'key': key})
+                self._remove_legacy_file(for_node_id, key)
+        
+        return backups
+    
     def transfer_backups_to_primary(self, for_node_id: int):
         """
         Promote backup keys to primary (used when a node fails and we take over).
@@ -237,22 +525,17 @@ class ChordStorage:
         Args:
             for_node_id: ID of the failed node whose backups we're promoting
         """
-        if for_node_id in self.backup_store:
-            for key, (value, version) in self.backup_store[for_node_id].items():
-                # Only promote if we don't have it or backup is newer
-                if key not in self.primary_store:
-                    self.primary_store[key] = (value, version)
-                    if self.enable_persistence:
-                        self._save_primary(key, value, version)
-                else:
-                    _, current_version = self.primary_store[key]
-                    if version > current_version:
-                        self.primary_store[key] = (value, version)
-                        if self.enable_persistence:
-                            self._save_primary(key, value, version)
-            
-            # Clear the backup after promotion
-            del self.backup_store[for_node_id]
+        backups = self.backup_store.pop(for_node_id, None)
+        if backups:
+            primary_get = self.primary_store.get
+            # Only promote if we don't have it or backup is newer
+            promoted = {}
+            for key, item in backups.items():
+                current = primary_get(key)
+                if current is None or item[1] > current[1]:
+                    promoted[key] = item
+            # Clear the backup after promotion (popped above)
+            self.put_many(promoted)
     
     # ==================== End of Persistent Storage Methods ====================
     
@@ -321,12 +604,14 @@ class ChordStorage:
         """
         if key in self.primary_store:
             del self.primary_store[key]
+            self._key_ids.pop(key, None)
             
             # Delete from disk if persistence enabled
             if self.enable_persistence:
-                key_file = os.path.join(self.primary_dir, f"{key}.txt")
-                if os.path.exists(key_file):
-                    os.remove(key_file)
+                self._append(None, {'op': 'del', 'key': key})
+                # The tombstone already wins over an old-layout file on replay;
+                # drop the file anyway so the directory stays tidy
+                self._remove_legacy_file(None, key)
             
             return True
         return False
@@ -347,10 +632,8 @@ class ChordStorage:
             
             # Delete from disk if persistence enabled
             if self.enable_persistence:
-                node_backup_dir = os.path.join(self.backup_dir, f"node_{for_node_id}")
-                key_file = os.path.join(node_backup_dir, f"{key}.txt")
-                if os.path.exists(key_file):
-                    os.remove(key_file)
+                self._append(for_node_id, {'op': 'del', 'key': key})
+                self._remove_legacy_file(for_node_id, key)
             
             return True
         return False
@@ -373,6 +656,17 @@ class ChordStorage:
         """
         return {node_id: keys.copy() for node_id, keys in self.backup_store.items()}
     
+    def iter_primary_items(self):
+        """
+        Iterate over primary (key, (value, version)) pairs without copying the store.
+        
+        Callers must not add or remove keys while iterating.
+        
+        Returns:
+            Iterator over (key, (value, version)) tuples
+        """
+        return iter(self.primary_store.items())
+    
     def has_key(self, key: str) -> bool:
         """
         Check if a key exists in storage.
@@ -394,7 +688,30 @@ class ChordStorage:
         """
         return list(self.primary_store.keys())
     
-    def get_keys_in_range(self, start: int, end: int, inclusive_start: bool = False) -> list:
+    def iter_key_ids(self, m: int = None):
+        """
+        Yield (key, hash_key(key, m)) for every primary key.
+        
+        Ids are remembered per key, so repeated scans (e.g. one per joining
+        node) only hash keys stored since the last scan.
+        
+        Args:
+            m: Bit size of identifier space (from config if None)
+        """
+        if m is None:
+            from config import M
+            m = M
+        if m != self._key_ids_m:
+            self._key_ids.clear()
+            self._key_ids_m = m
+        key_ids = self._key_ids
+        for key in self.primary_store:
+            key_id = key_ids.get(key)
+            if key_id is None:
+                key_id = key_ids[key] = _hash_key(key, m)
+            yield key, key_id
+    
+    def get_keys_in_range(self, start: int, end: int, inclusive_start: bool = False, m: int = None) -> list:
         """
         Get all keys whose hash falls in the range (start, end].
         
@@ -402,16 +719,24 @@ class ChordStorage:
             start: Start of range (exclusive by default)
             end: End of range (inclusive)
             inclusive_start: If True, include start in range
+            m: Bit size of identifier space (from config if None)
             
         Returns:
             List of keys in the range
         """
-        keys_in_range = []
-        for key in self.primary_store.keys():
-            key_hash = hash_key(key)
-            if in_range(key_hash, start, end, inclusive_start):
-                keys_in_range.append(key)
-        return keys_in_range
+        if m is None:
+            from config import M
+            m = M
+        if start == end:
+            # Full circle
+            return list(self.primary_store)
+        # Same test as in_range(), but with the wraparound folded into the mask
+        # so the per-key check is a single comparison
+        mask = (1 << m) - 1
+        low = start if inclusive_start else start + 1
+        span = (end - low) & mask
+        return [key for key, key_hash in self.iter_key_ids(m)
+                if (key_hash - low) & mask <= span]
     
     def transfer_keys(self, keys: list) -> Dict[str, Tuple[Any, VectorClock]]:
         """
@@ -428,6 +753,7 @@ class ChordStorage:
             if key in self.primary_store:
                 transferred[key] = self.primary_store[key]
                 del self.primary_store[key]
+                self._key_ids.pop(key, None)
         return transferred
     
     def receive_keys(self, data: Dict[str, Tuple[Any, VectorClock]]):
@@ -437,14 +763,12 @@ class ChordStorage:
         Args:
             data: Dictionary of key -> (value, version) tuples
         """
-        for key, (value, version) in data.items():
-            # Only update if we don't have the key or incoming version is newer
-            if key not in self.primary_store:
-                self.primary_store[key] = (value, version)
-            else:
-                _, current_version = self.primary_store[key]
-                if version > current_version:
-                    self.primary_store[key] = (value, version)
+        primary_get = self.primary_store.get
+        # Only update if we don't have the key or incoming version is newer
+        self.primary_store.update({
+            key: item for key, item in data.items()
+            if (current := primary_get(key)) is None or item[1] > current[1]
+        })
     
     def size(self) -> int:
         """Get the number of keys in storage."""
@@ -453,6 +777,7 @@ class ChordStorage:
     def clear(self):
         """Clear all data from storage."""
         self.primary_store.clear()
+        self._key_ids.clear()
     
     def __repr__(self) -> str:
         return f"ChordStorage(node={self.node_id}, keys={self.size()})"
@@ -472,13 +797,18 @@ def hash_key(key: str, m: int = None) -> int:
     if m is None:
         from config import M
         m = M
-    
+    return _hash_key(key, m)
+
+
+@lru_cache(maxsize=1024)
+def _hash_key(key: str, m: int) -> int:
+    """hash_key() with m resolved; memoized since hot keys are hashed repeatedly."""
     # Use SHA-1 hash
-    hash_obj = hashlib.sha1(key.encode())
-    hash_bytes = hash_obj.digest()
-    # Convert to integer and mod by 2^m
-    hash_int = int.from_bytes(hash_bytes, byteorder='big')
-    return hash_int % (2 ** m)
+    hash_bytes = hashlib.sha1(key.encode()).digest()
+    # Only the low m bits survive the mod by 2^m, so convert just the
+    # trailing bytes that hold them and mask the rest off
+    hash_int = int.from_bytes(hash_bytes[-((m + 7) // 8):], byteorder='big')
+    return hash_int & ((1 << m) - 1)
 
 
 def in_range(identifier: int, start: int, end: int, inclusive_start: bool = False) -> bool:
@@ -55,6 +55,7 @@ class MessageType(Enum):
     RECOVER_HANDOFF = "recover_handoff"
     RECOVER_HANDOFF_REPLY = "recover_handoff_reply"
     UPDATE_BACKUP = "update_backup"
+    UPDATE_BACKUP_BATCH = "update_backup_batch"  # {key: {value, version}} in one message
     UPDATE_BACKUP_ACK = "update_backup_ack"
     
     # Debug/Status
@@ -22,6 +22,9 @@ STABILIZE_INTERVAL = 3.0  # seconds
 FIX_FINGERS_INTERVAL = 3.0  # seconds
 CHECK_PREDECESSOR_INTERVAL = 3.0  # seconds
 
+# Storage Parameters
+STORAGE_SYNC_INTERVAL = 0.1  # seconds between fsyncs of the storage write-ahead logs
+
 # Replication and Consistency
 REPLICATION_TIMEOUT = 2.0  # seconds
 READ_REPAIR_ENABLED = True
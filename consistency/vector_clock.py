@@ -2,7 +2,7 @@
 Vector Clock implementation for tracking causality and versioning.
 """
 
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 import copy
 
 
@@ -89,23 +89,27 @@ class VectorClock:
         Returns:
             True if this happens before other
         """
-        all_less_or_equal = True
+        mine = self.clock
+        theirs = other.clock
         at_least_one_less = False
         
-        # Check all nodes in both clocks
-        all_nodes = set(self.clock.keys()) | set(other.clock.keys())
-        
-        for node_id in all_nodes:
-            self_val = self.clock.get(node_id, 0)
-            other_val = other.clock.get(node_id, 0)
-            
+        # Walk each clock's own entries instead of building the union of node ids;
+        # a node missing from one side counts as 0 there
+        for node_id, self_val in mine.items():
+            other_val = theirs.get(node_id, 0)
             if self_val > other_val:
-                all_less_or_equal = False
-                break
-            elif self_val < other_val:
+                return False
+            if self_val < other_val:
                 at_least_one_less = True
         
-        return all_less_or_equal and at_least_one_less
+        for node_id, other_val in theirs.items():
+            if node_id not in mine:
+                if other_val < 0:
+                    return False
+                if other_val > 0:
+                    at_least_one_less = True
+        
+        return at_least_one_less
     
     def concurrent_with(self, other: 'VectorClock') -> bool:
         """
@@ -149,6 +153,10 @@ class VectorClock:
         if not isinstance(other, VectorClock):
             return False
         
+        # Identical dicts are the common case; compare them at C speed first
+        if self.clock == other.clock:
+            return True
+        
         all_nodes = set(self.clock.keys()) | set(other.clock.keys())
         
         for node_id in all_nodes:
@@ -230,6 +238,47 @@ def compare_versions(v1: VectorClock, v2: VectorClock) -> str:
         return "concurrent"
 
 
+def compare_and_merge(v1: VectorClock, v2: VectorClock) -> Tuple[str, VectorClock]:
+    """
+    Compare two vector clocks and compute their element-wise maximum in one pass.
+    
+    Args:
+        v1: First vector clock
+        v2: Second vector clock
+        
+    Returns:
+        Tuple of (relationship, merged clock), where relationship is one of
+        compare_versions' strings: "v1<v2", "v1>v2", "v1=v2", or "concurrent"
+    """
+    if v1.clock == v2.clock:
+        return "v1=v2", VectorClock(v1.clock)
+    
+    merged = {}
+    v1_ahead = False
+    v2_ahead = False
+    
+    for node_id in v1.clock.keys() | v2.clock.keys():
+        v1_val = v1.clock.get(node_id, 0)
+        v2_val = v2.clock.get(node_id, 0)
+        
+        if v1_val > v2_val:
+            v1_ahead = True
+            merged[node_id] = v1_val
+        else:
+            v2_ahead = v2_ahead or v1_val < v2_val
+            merged[node_id] = v2_val
+    
+    if v1_ahead and v2_ahead:
+        relationship = "concurrent"
+    elif v1_ahead:
+        relationship = "v1>v2"
+    elif v2_ahead:
+        relationship = "v1<v2"
+    else:
+        relationship = "v1=v2"
+    return relationship, VectorClock(merged)
+
+
 def get_latest_version(versions: list) -> Optional[VectorClock]:
     """
     Get the latest (most recent) version from a list of vector clocks.
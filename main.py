@@ -190,6 +190,10 @@ async def run_node(args):
                 node.storage.put_backup(key, value, version, for_node_id=primary_node_id)
                 logger.info(f"Stored {key}={value} as BACKUP for node {primary_node_id} (sloppy quorum) with version {version}")
             
+            # The local write counts towards the quorum, so it has to reach the
+            # OS before anyone is told it succeeded
+            node.storage.flush()
+            
             # NEW: Use full ring knowledge to get N replicas from the key hash
             # This ensures we get the CORRECT replicas even if primary is down
             all_replicas = node.finger_table.get_n_successors(key_hash, args.N)
@@ -534,6 +538,7 @@ async def run_node(args):
             # If primary_node_id is the sender, they're the actual primary
             # If primary_node_id is different, this is sloppy quorum (primary is down)
             node.storage.put_backup(key, value, version, for_node_id=primary_node_id)
+            node.storage.flush()  # written out before we ack
             
             if primary_node_id == msg.sender_id:
                 logger.info(f"BACKUP STORED: key='{key}' value='{value}' for PRIMARY node {primary_node_id}")
@@ -608,10 +613,8 @@ async def run_node(args):
         from communication.message import create_reply_msg
         from chord.storage import hash_key
         
-        all_keys = node.storage.get_all_keys()
         data = {}
-        for key in all_keys:
-            value, version = node.storage.get_with_version(key)
+        for key, (value, version) in node.storage.iter_primary_items():
             key_hash = hash_key(key, args.m)
             data[key] = {
                 'value': value,
@@ -749,11 +752,10 @@ async def run_node(args):
         """Handle GET_ALL_NODES request - return list of all known nodes."""
         from communication.message import create_reply_msg
         
-        # Get all nodes from finger table
-        all_nodes = node.finger_table.get_all_nodes()
+        # Get all nodes from finger table (read-only, so no copy)
+        nodes_set = {n.node_id: n for n in node.finger_table.iter_all_nodes()}
         
         # Also add ourselves, predecessor, and successor list
-        nodes_set = {n.node_id: n for n in all_nodes}
         nodes_set[node.node_id] = node.get_info()
         
         if node.predecessor:
@@ -786,7 +788,7 @@ async def run_node(args):
         node.finger_table.add_node(new_node)
         
         # Also notify the node that we exist (mutual awareness)
-        logger.info(f"Added {new_node} to finger table, now have {len(node.finger_table.get_all_nodes())} nodes")
+        logger.info(f"Added {new_node} to finger table, now have {node.finger_table.node_count()} nodes")
         
         return create_reply_msg(
             node.node_id,
@@ -799,7 +801,6 @@ async def run_node(args):
     async def handle_transfer_keys_request(msg):
         """Handle TRANSFER_KEYS_REQUEST - send keys that belong to the new node."""
         from communication.message import create_reply_msg
-        from chord.storage import hash_key
         
         new_node_id = msg.data['new_node_id']
         predecessor_id = msg.data.get('predecessor_id')
@@ -810,9 +811,8 @@ async def run_node(args):
         # Keys belong to new node if their hash is between predecessor_id and new_node_id
         keys_to_transfer = {}
         
-        for key in node.storage.get_all_keys():
-            key_hash = hash_key(key, args.m)
-            
+        # Key ids are cached in storage across requests, so only new keys get hashed
+        for key, key_hash in node.storage.iter_key_ids(args.m):
             # Check if this key should belong to the new node
             if predecessor_id is not None:
                 from chord.routing import in_range
@@ -866,8 +866,10 @@ async def run_node(args):
         requesting_node_id = msg.data.get('requesting_node_id', msg.sender_id)
         logger.info(f"RECOVER_HANDOFF: Node {requesting_node_id} requesting hinted handoff data")
         
-        # Get all backup keys for this node
-        backup_keys = node.storage.get_all_backups_for_node(requesting_node_id)
+        # Take all backup keys for this node; they are deleted from our storage
+        # here since the handoff completes with this reply
+        backup_keys = node.storage.pop_backups_for_node(requesting_node_id)
+        node.storage.flush()
         
         # Prepare response data
         keys_data = {}
@@ -878,11 +880,7 @@ async def run_node(args):
             }
         
         logger.info(f"Sending {len(keys_data)} hinted handoff keys to node {requesting_node_id}")
-        
-        # Delete the backups from our storage (handoff complete)
-        for key in backup_keys.keys():
-            node.storage.delete_backup(key, requesting_node_id)
-            logger.debug(f"Deleted backup hint for key '{key}' (node {requesting_node_id})")
+        logger.debug(f"Deleted {len(backup_keys)} backup hints for node {requesting_node_id}")
         
         return create_reply_msg(
             node.node_id,
@@ -912,6 +910,7 @@ async def run_node(args):
             
             # Update or create backup
             node.storage.put_backup(key, value, version, for_node_id=primary_node_id)
+            node.storage.flush()  # written out before we ack
             logger.info(f"BACKUP UPDATED: key='{key}' value='{value}' for primary node {primary_node_id}")
             
             return create_reply_msg(
@@ -931,6 +930,42 @@ async def run_node(args):
                 msg.msg_id
             )
     
+    async def handle_update_backup_batch(msg):
+        """
+        Handle UPDATE_BACKUP_BATCH request - update or create several backup
+        replicas for one primary node, sent as {key: {value, version}}.
+        """
+        from communication.message import create_reply_msg
+        from consistency.vector_clock import VectorClock
+        
+        try:
+            keys = msg.data['keys']
+            primary_node_id = msg.data.get('primary_node_id', msg.sender_id)
+            
+            for key, item in keys.items():
+                version = VectorClock.from_dict(item['version'])
+                node.storage.put_backup(key, item['value'], version, for_node_id=primary_node_id)
+            # One flush for the whole batch, before we ack
+            node.storage.flush()
+            logger.info(f"BACKUPS UPDATED: {len(keys)} keys for primary node {primary_node_id}")
+            
+            return create_reply_msg(
+                node.node_id,
+                node.address,
+                MessageType.UPDATE_BACKUP_ACK,
+                {'status': 'ok', 'count': len(keys)},
+                msg.msg_id
+            )
+        except Exception as e:
+            logger.error(f"UPDATE_BACKUP_BATCH handler error: {e}")
+            return create_reply_msg(
+                node.node_id,
+                node.address,
+                MessageType.UPDATE_BACKUP_ACK,
+                {'status': 'error', 'error': str(e)},
+                msg.msg_id
+            )
+    
     network.register_handler(MessageType.GET_ALL_NODES, handle_get_all_nodes)
     network.register_handler(MessageType.BROADCAST_JOIN, handle_broadcast_join)
     network.register_handler(MessageType.TRANSFER_KEYS_REQUEST, handle_transfer_keys_request)
@@ -939,6 +974,7 @@ async def run_node(args):
     network.register_handler(MessageType.UPDATE_BACKUP, handle_update_backup)
     network.register_handler(MessageType.RECOVER_HANDOFF, handle_recover_handoff)
     network.register_handler(MessageType.UPDATE_BACKUP, handle_update_backup)
+    network.register_handler(MessageType.UPDATE_BACKUP_BATCH, handle_update_backup_batch)
     
     # Start network server
     await network.start()
@@ -958,7 +994,7 @@ async def run_node(args):
         await node.join_ring_full(known_node, network)
         
         logger.info(f"Joined ring. Successor: {node.finger_table.get_successor()}")
-        logger.info(f"Full ring knowledge: {len(node.finger_table.get_all_nodes())} nodes")
+        logger.info(f"Full ring knowledge: {node.finger_table.node_count()} nodes")
         
         # Immediately stabilize and update successor list after joining
         await node.stabilize_network(network)
@@ -1018,11 +1054,31 @@ async def run_node(args):
             except Exception as e:
                 logger.error(f"Fix fingers error: {e}")
     
+    async def storage_sync_loop():
+        """Periodically flush the storage write-ahead logs and fsync them off the event loop."""
+        loop = asyncio.get_running_loop()
+        sync_future = None
+        while True:
+            try:
+                await asyncio.sleep(config.STORAGE_SYNC_INTERVAL)
+                node.storage.flush()
+                sync_future = loop.run_in_executor(None, node.storage.sync)
+                # Shielded so cancelling this loop does not detach us from the fsync
+                await asyncio.shield(sync_future)
+            except asyncio.CancelledError:
+                # Let a running fsync finish before shutdown closes the logs
+                if sync_future is not None:
+                    await asyncio.gather(sync_future, return_exceptions=True)
+                break
+            except Exception as e:
+                logger.error(f"Storage sync error: {e}")
+    
     # Create tasks
     tasks = [
         asyncio.create_task(update_successor_list_loop()),
         asyncio.create_task(stabilization_loop()),
         asyncio.create_task(fix_fingers_loop()),
+        asyncio.create_task(storage_sync_loop()),
     ]
     
     try:
@@ -1041,6 +1097,9 @@ async def run_node(args):
         # Stop network
         await network.stop()
         
+        # Flush anything still buffered for disk
+        node.storage.close()
+        
         logger.info("Node stopped")
 
 
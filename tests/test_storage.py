@@ -0,0 +1,158 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from chord.storage import ChordStorage
+from consistency.vector_clock import VectorClock
+
+
+class TestPersistentStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.base_dir = tempfile.mkdtemp()
+        self.primary_dir = os.path.join(self.base_dir, 'node_5', 'primary')
+        self.backup_dir = os.path.join(self.base_dir, 'node_5', 'backup')
+
+    def tearDown(self):
+        shutil.rmtree(self.base_dir)
+
+    def open_storage(self):
+        return ChordStorage(5, base_dir=self.base_dir, enable_persistence=True)
+
+    def reopen(self, storage):
+        storage.close()
+        storage = self.open_storage()
+        storage.load_all_primary()
+        storage.load_all_backups()
+        return storage
+
+    def wal_lines(self, path):
+        with open(path, 'rb') as f:
+            return [line for line in f.read().split(b'\n') if line]
+
+    def test_put_delete_round_trip(self):
+        storage = self.open_storage()
+        storage.put('a', 1)
+        storage.put('a', 2)
+        storage.put('b', {'nested': [1, 'x']})
+        storage.put('c', 3)
+        storage.delete('c')
+        storage.put_backup('x', 'bx', VectorClock({9: 2}), for_node_id=9)
+        storage.put_backup('y', 'by', VectorClock({9: 1}), for_node_id=9)
+        storage.delete_backup('y', for_node_id=9)
+
+        storage = self.reopen(storage)
+        self.assertEqual(storage.get('a'), (2, VectorClock({5: 2})))
+        self.assertEqual(storage.get_value('b'), {'nested': [1, 'x']})
+        self.assertIsNone(storage.get('c'))
+        self.assertEqual(storage.get_all_backups_for_node(9), {'x': ('bx', VectorClock({9: 2}))})
+        storage.close()
+
+    def test_large_integers_survive(self):
+        storage = self.open_storage()
+        storage.put('big', 1 << 70)
+        storage = self.reopen(storage)
+        self.assertEqual(storage.get_value('big'), 1 << 70)
+        storage.close()
+
+    def test_torn_trailing_line_is_skipped(self):
+        storage = self.open_storage()
+        storage.put('a', 1)
+        storage.close()
+        with open(os.path.join(self.primary_dir, 'wal.log'), 'ab') as f:
+            f.write(b'{"op": "put", "key": "b", "va')
+
+        # Appending after the torn record must not corrupt the next one
+        storage = self.open_storage()
+        storage.put('c', 3)
+        storage = self.reopen(storage)
+        self.assertEqual(storage.get_value('a'), 1)
+        self.assertIsNone(storage.get('b'))
+        self.assertEqual(storage.get_value('c'), 3)
+        storage.close()
+
+    def test_legacy_layout_is_migrated(self):
+        os.makedirs(self.primary_dir)
+        os.makedirs(os.path.join(self.backup_dir, 'node_9'))
+        with open(os.path.join(self.primary_dir, 'old.txt'), 'w') as f:
+            json.dump({'key': 'old', 'value': 'o', 'version': {'5': 1}, 'type': 'primary'}, f, indent=2)
+        with open(os.path.join(self.backup_dir, 'node_9', 'ob.txt'), 'w') as f:
+            json.dump({'key': 'ob', 'value': 'b', 'version': {'9': 1}, 'type': 'backup',
+                       'primary_node_id': 9}, f, indent=2)
+
+        storage = self.open_storage()
+        self.assertEqual(storage.load_all_primary(), 1)
+        self.assertEqual(storage.load_all_backups(), 1)
+        self.assertEqual(storage.get('old'), ('o', VectorClock({5: 1})))
+        # The old files are folded into the logs and removed
+        self.assertEqual(os.listdir(self.primary_dir), ['wal.log'])
+        self.assertEqual(os.listdir(self.backup_dir), ['wal_backup_9.log'])
+
+        storage = self.reopen(storage)
+        self.assertEqual(storage.get('old'), ('o', VectorClock({5: 1})))
+        self.assertEqual(storage.get_backup('ob', for_node_id=9), ('b', VectorClock({9: 1})))
+        storage.close()
+
+    def test_load_compacts_superseded_records(self):
+        storage = self.open_storage()
+        for i in range(10):
+            storage.put('a', i)
+        storage.put('b', 1)
+        storage.delete('b')
+        storage.put_backup('x', 1, VectorClock({9: 1}), for_node_id=9)
+        storage.put_backup('x', 2, VectorClock({9: 2}), for_node_id=9)
+
+        storage = self.reopen(storage)
+        self.assertEqual(len(self.wal_lines(os.path.join(self.primary_dir, 'wal.log'))), 1)
+        self.assertEqual(len(self.wal_lines(os.path.join(self.backup_dir, 'wal_backup_9.log'))), 1)
+        self.assertEqual(storage.get_value('a'), 9)
+        storage = self.reopen(storage)
+        self.assertEqual(storage.get_value('a'), 9)
+        self.assertEqual(storage.get_backup('x', for_node_id=9), (2, VectorClock({9: 2})))
+        storage.close()
+
+    def test_log_is_compacted_while_running(self):
+        storage = self.open_storage()
+        storage.WAL_COMPACT_MIN = 20
+        for i in range(100):
+            storage.put('k%d' % (i % 3), i)
+        storage.commit()
+        self.assertLessEqual(len(self.wal_lines(os.path.join(self.primary_dir, 'wal.log'))), 20)
+
+        storage = self.reopen(storage)
+        self.assertEqual({key: storage.get_value(key) for key in ('k0', 'k1', 'k2')},
+                         {'k0': 99, 'k1': 97, 'k2': 98})
+        storage.close()
+
+    def test_flushed_write_survives_without_close(self):
+        storage = self.open_storage()
+        storage.put('a', 1)
+        storage.flush()
+        # A second instance reads the files as they are, as after a crash
+        other = self.open_storage()
+        self.assertEqual(other.load_all_primary(), 1)
+        self.assertEqual(other.get_value('a'), 1)
+        other.close()
+        storage.close()
+
+    def test_sync_on_worker_thread_races_close(self):
+        storage = self.open_storage()
+        for i in range(50):
+            storage.put('k%d' % i, i)
+            storage.put_backup('b%d' % i, i, VectorClock({9: i + 1}), for_node_id=9)
+            storage.flush()
+            worker = threading.Thread(target=storage.sync)
+            worker.start()
+        storage.close()
+        worker.join()
+
+        storage = self.reopen(storage)
+        self.assertEqual(len(storage.get_all_primary_keys()), 50)
+        storage.close()
+
+
+if __name__ == '__main__':
+    unittest.main()